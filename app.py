@@ -1,18 +1,189 @@
-import os
+import time
+import uuid
+import hashlib
 import streamlit as st
-import pandas as pd
 from dotenv import load_dotenv
-from src.utils.helpers import *
-from src.generator.question_generator import QuestionGenerator
+from src.utils.quiz_manager import QuizManager
+from src.cache.session_store import encode_state, get_session_store
+from src.cache.study_sets import (
+    STUDY_SET_FIELDS, dumps_study_set, get_study_set_library, iter_study_sets, load_study_set, make_study_set, study_set_meta,
+    validate_study_set,
+)
+from src.models.flashcard_schema import Flashcard
+from src.models.summary_schema import SummarySchema
+from src.utils.pdf_extractor import extract_text_from_pdf
+from src.common.metrics import start_metrics_server
+from src.config.setting import settings
 load_dotenv()
 
+STAGE_LABELS = {"summary": "Summary", "flashcards": "Flashcards", "quiz": "Quiz"}
+SESSION_KEYS = ("quiz_generated", "quiz_submitted", "step", "source_content", "job_id", "study_set")
+
+@st.cache_resource
+def metrics_server():
+    # Streamlit has no custom routes, so /metrics is served on a side port once per process
+    if settings.METRICS_PORT:
+        return start_metrics_server(settings.METRICS_PORT)
+    return None
+
+def session_id():
+    # Kept in the URL so a reconnect routed to another replica finds the same stored session
+    sid = st.query_params.get("sid")
+    if not sid:
+        sid = uuid.uuid4().hex
+        st.query_params["sid"] = sid
+    return sid
+
+def source_record_id(digest):
+    # Sources live in their own record, written once per distinct source and shared by sessions
+    return f"source:{digest}"
+
+def restore_session(store):
+    """Rehydrates a session saved by another replica or an earlier pod on its first run in this process."""
+    if store is None or 'quiz_manager' in st.session_state:
+        return
+    state = store.load(session_id())
+    if state:
+        st.session_state.quiz_manager = QuizManager.from_state(state["quiz_manager"])
+        for key in SESSION_KEYS:
+            if key in state:
+                st.session_state[key] = state[key]
+        if state.get("source_digest"):
+            source = store.load(source_record_id(state["source_digest"]))
+            st.session_state.source_content = source["source_content"] if source else ""
+
+def persist_session(store):
+    """Saves the session when it changed; the source (up to PDF_MAX_CHARS) is only written when it changes."""
+    if store is None or 'quiz_manager' not in st.session_state:
+        return
+    source = st.session_state.source_content
+    # str caches its hash(), so an unchanged source costs nothing here; only a new one is hashed and written
+    marker, source_digest = st.session_state.get("_source_marker", (None, None))
+    if marker != (len(source), hash(source)):
+        source_digest = hashlib.sha256(source.encode("utf-8")).hexdigest() if source else ""
+        if source:
+            store.save(source_record_id(source_digest), {"source_content": source})
+        st.session_state["_source_marker"] = ((len(source), hash(source)), source_digest)
+    state = {
+        "quiz_manager": st.session_state.quiz_manager.to_state(),
+        **{key: st.session_state[key] for key in SESSION_KEYS if key != "source_content"},
+        "source_digest": source_digest,
+    }
+    digest = hashlib.sha256(encode_state(state)).hexdigest()
+    if st.session_state.get("_session_digest") != digest:
+        store.save(session_id(), state)
+        st.session_state["_session_digest"] = digest
+
+def watch_job(job_id):
+    """Polls a generation job and renders its progress until it finishes; returns the final job record.
+
+    The work runs in the job queue, so a rerun or reconnect simply starts watching again.
+    """
+    from src.generator.jobs import get_job_queue, get_job_store
+    store, jobs = get_job_store(), get_job_queue()
+    job = store.get(job_id)
+    if job is None:
+        return None
+    
+    status = st.status("🚀 Processing...", expanded=True)
+    with status:
+        st.write("Generating Summary, Flashcards and Quiz...")
+        quiz_progress = st.progress(0.0, text="Crafting Quiz...")
+    
+    # Summary and flashcards render here as they stream in
+    summary_tab, cards_tab = st.tabs(["📝 Summary", "🗂️ Flashcards"])
+    boxes = {"summary": summary_tab.empty(), "flashcards": cards_tab.empty()}
+    shown, reported = {}, set()
+    while True:
+        num_questions = job.params["num_questions"]
+        quiz_progress.progress(min(1.0, len(job.questions) / num_questions), text=f"Crafting Quiz... {min(len(job.questions), num_questions)}/{num_questions}")
+        for stage, info in job.stages.items():
+            if info["status"] == "error" and (stage, "error") not in reported:
+                status.warning(f"{STAGE_LABELS[stage]} failed: {info['error']}")
+                reported.add((stage, "error"))
+            if stage in boxes and info["value"] is not None and shown.get(stage) != info["value"]:
+                shown[stage] = info["value"]
+                with boxes[stage].container():
+                    if stage == "summary":
+                        render_summary(SummarySchema.model_validate(info["value"]))
+                    else:
+                        render_flashcards([Flashcard.model_validate(card) for card in info["value"]])
+            if stage in boxes and info["status"] == "done" and (stage, "done") not in reported:
+                status.write("✅ Summary ready" if stage == "summary" else f"✅ {len(info['value'])} Flashcards ready")
+                reported.add((stage, "done"))
+        
+        if job.finished:
+            break
+        jobs.resume_if_stalled(job, settings.JOB_STALE_SECONDS)
+        time.sleep(settings.JOB_POLL_SECONDS)
+        job = store.get(job_id)
+    
+    if job.quiz_complete():
+        quiz_progress.progress(1.0, text=f"✅ {job.params['num_questions']} Questions ready")
+    if job.status == "done":
+        status.update(label="Ready!", state="complete")
+    else:
+        status.update(label="Error!", state="error")
+    return job
+
+def render_summary(summary):
+    st.header("Content Summary")
+    st.subheader(summary.main_idea)
+    for point in summary.key_points:
+        st.markdown(f"- {point}")
+
+def render_flashcards(flashcards):
+    st.header("Flashcards")
+    for i, card in enumerate(flashcards):
+        with st.expander(f"Card {i+1}: {card.front}"):
+            st.info(f"Answer: {card.back}")
+
+def open_study_set():
+    """Step 1 source that skips generation: reopens study sets exported earlier or pre-generated in batch."""
+    upload = st.file_uploader("Upload Study Set", type=["jsonl", "gz"], key="study_set_uploader")
+    if not upload:
+        return
+    try:
+        records = [validate_study_set(record) for record in iter_study_sets(upload.getvalue())]
+    except (OSError, ValueError) as e:
+        st.error(f"Not a study set file: {e}")
+        return
+    if not records:
+        st.error("The file contains no study sets.")
+        return
+    index = 0
+    if len(records) > 1:
+        index = st.selectbox("Study Set", range(len(records)), format_func=lambda i: records[i]["title"], key="study_set_select")
+    if st.button("Open Study Set ➡️", use_container_width=True, key="open_study_set_btn"):
+        record = records[index]
+        try:
+            quiz_manager = load_study_set(record)
+        except ValueError as e:
+            st.error(f"Could not open study set: {e}")
+            return
+        st.session_state.quiz_manager = quiz_manager
+        st.session_state.update({
+            "quiz_generated": True, "quiz_submitted": bool(quiz_manager.results),
+            "study_set": {field: record[field] for field in STUDY_SET_FIELDS},
+        })
+        st.rerun()
+
 def main():
     st.set_page_config(
         page_title="Study-AI",
         page_icon=":books:",
         layout="wide"
     )
-    
+    metrics_server()
+    store = get_session_store()
+    restore_session(store)
+    try:
+        render_page()
+    finally:
+        # Also runs when st.rerun() interrupts the script, so every change reaches the store
+        persist_session(store)
+
+def render_page():
     # State Initialization
     if 'quiz_manager' not in st.session_state:
         st.session_state.quiz_manager = QuizManager()
@@ -24,6 +195,10 @@ def main():
         st.session_state.step = 1
     if 'source_content' not in st.session_state:
         st.session_state.source_content = ""
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = None
+    if 'study_set' not in st.session_state:
+        st.session_state.study_set = None
 
     # CSS Injection (Simplified for Maximum Compatibility)
     st.markdown("""
@@ -79,7 +254,7 @@ def main():
     with col2:
         if st.session_state.quiz_generated:
             if st.button("🔄 New Session", use_container_width=True, key="new_session_main"):
-                st.session_state.update({"quiz_generated": False, "quiz_submitted": False, "step": 1, "source_content": ""})
+                st.session_state.update({"quiz_generated": False, "quiz_submitted": False, "step": 1, "source_content": "", "job_id": None, "study_set": None})
                 st.rerun()
     st.markdown("---")
     
@@ -99,7 +274,7 @@ def main():
             
             source_type = st.radio(
                 "How would you like to provide content?", 
-                ["Topic", "Text Paste", "PDF Upload"], 
+                ["Topic", "Text Paste", "PDF Upload", "Study Set"], 
                 horizontal=True,
                 key="source_type_radio"
             )
@@ -119,9 +294,11 @@ def main():
                     else:
                         st.session_state.source_content = text
                         st.success("PDF Extracted!")
+            elif source_type == "Study Set":
+                open_study_set()
             
             st.write("")
-            if st.button("Continue to Setup ➡️", use_container_width=True, key="continue_btn"):
+            if source_type != "Study Set" and st.button("Continue to Setup ➡️", use_container_width=True, key="continue_btn"):
                 if not st.session_state.source_content:
                     st.error("Please provide content!")
                 else:
@@ -129,6 +306,8 @@ def main():
                     st.rerun()
 
         elif st.session_state.step == 2:
+            # The LLM stack is imported once a session reaches setup, not on every cold start
+            from src.generator.jobs import apply_job, get_job_queue, get_job_store
             st.markdown('<div class="section-header">⚙️ Step 2: Configure Session</div>', unsafe_allow_html=True)
             
             col1, col2 = st.columns(2)
@@ -145,23 +324,35 @@ def main():
                 st.session_state.step = 1
                 st.rerun()
             if c2.button("✨ Generate Materials", use_container_width=True, key="gen_btn"):
-                with st.status("🚀 Processing...", expanded=True) as status:
-                    generator = QuestionGenerator()
-                    st.write("Generating Summary...")
-                    st.session_state.quiz_manager.generate_summary(generator, st.session_state.source_content[:4000])
-                    st.write("Creating Flashcards...")
-                    st.session_state.quiz_manager.generate_flashcards(generator, st.session_state.source_content[:2000], n_cards)
-                    st.write("Crafting Quiz...")
-                    success = st.session_state.quiz_manager.generate_questions(
-                        generator, st.session_state.source_content[:2000], q_type, diff, n_ques,
-                        progress_callback=lambda p: None
-                    )
-                    if success:
-                        status.update(label="Ready!", state="complete")
-                        st.session_state.quiz_generated = True
+                meta = study_set_meta(st.session_state.source_content, q_type, diff)
+                library = get_study_set_library()
+                record = library.find(st.session_state.source_content, q_type, diff, n_ques, n_cards) if library else None
+                if record:
+                    # Pre-generated offline by the batch CLI: no LLM calls at all
+                    st.session_state.quiz_manager = load_study_set(record, n_ques, n_cards, with_results=False)
+                    st.session_state.update({"quiz_generated": True, "study_set": meta, "source_content": ""})
+                    st.rerun()
+                st.session_state.study_set = meta
+                st.session_state.job_id = get_job_store().create({
+                    "topic": st.session_state.source_content, "question_type": q_type, "difficulty": diff,
+                    "num_questions": n_ques, "num_cards": n_cards,
+                })
+                get_job_queue().submit(st.session_state.job_id)
+            
+            if st.session_state.job_id:
+                job = watch_job(st.session_state.job_id)
+                if job is None:
+                    st.session_state.job_id = None
+                elif job.status == "done" or (job.finished and st.button("Continue with what's ready ➡️", key="continue_job_btn")):
+                    if apply_job(job, st.session_state.quiz_manager):
+                        st.session_state.update({"quiz_generated": True, "job_id": None})
+                        # Nothing reads the source once materials exist; don't hold a whole PDF per session
+                        st.session_state.source_content = ""
                         st.rerun()
-                    else:
-                        status.update(label="Error!", state="error")
+                if job is not None and job.status == "failed" and st.button("🔁 Retry failed parts", key="retry_job_btn"):
+                    # Resumes the same job: finished stages and saved questions are kept
+                    get_job_queue().submit(job.job_id)
+                    st.rerun()
     
     else:
         # Results View
@@ -169,17 +360,11 @@ def main():
         
         with tab1:
             if st.session_state.quiz_manager.summary:
-                st.header("Content Summary")
-                st.subheader(st.session_state.quiz_manager.summary.main_idea)
-                for point in st.session_state.quiz_manager.summary.key_points:
-                    st.markdown(f"- {point}")
+                render_summary(st.session_state.quiz_manager.summary)
                     
         with tab2:
             if st.session_state.quiz_manager.flashcards:
-                st.header("Flashcards")
-                for i, card in enumerate(st.session_state.quiz_manager.flashcards):
-                    with st.expander(f"Card {i+1}: {card.front}"):
-                        st.info(f"Answer: {card.back}")
+                render_flashcards(st.session_state.quiz_manager.flashcards)
                         
         with tab3:
             if not st.session_state.quiz_submitted:
@@ -191,20 +376,25 @@ def main():
                     st.rerun()
             else:
                 st.header("Results 📊")
-                results_df = st.session_state.quiz_manager.get_results_dataframe()
-                if not results_df.empty:
-                    correct = results_df["is_correct"].sum()
-                    total = len(results_df)
+                quiz_manager = st.session_state.quiz_manager
+                if quiz_manager.results:
+                    correct, total = quiz_manager.score
                     st.metric("Score", f"{correct}/{total}", delta=f"{(correct/total)*100:.0f}%")
                     
-                    for _, row in results_df.iterrows():
-                        icon = "✅" if row['is_correct'] else "❌"
+                    for result in quiz_manager.results:
+                        icon = "✅" if result.is_correct else "❌"
                         with st.container():
-                            st.markdown(f"**Q{row['question_number']}**: {row['question']} {icon}")
-                            if not row['is_correct']:
-                                st.write(f"Yours: {row['user_answer']} | Correct: {row['correct_answer']}")
+                            st.markdown(f"**Q{result.question_number}**: {result.question} {icon}")
+                            if not result.is_correct:
+                                st.write(f"Yours: {result.user_answer} | Correct: {result.correct_answer}")
                             with st.expander("Why?"):
-                                st.write(row['explanation'])
+                                st.write(result.explanation)
+        
+        if st.session_state.study_set:
+            meta, quiz_manager = st.session_state.study_set, st.session_state.quiz_manager
+            # Serialized only when the button is clicked, not on every rerun
+            st.download_button("💾 Export Study Set", lambda: dumps_study_set(make_study_set(meta, quiz_manager)) + "\n",
+                               file_name="study_set.jsonl", mime="application/jsonl", key="export_study_set_btn")
     
     st.markdown('</div>', unsafe_allow_html=True)
                 
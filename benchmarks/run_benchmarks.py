@@ -0,0 +1,216 @@
+"""Offline benchmarks for quiz, summary/flashcard and PDF extraction paths.
+
+The Groq client is swapped for a deterministic ``FakeChatModel`` so runs need no API key or network,
+and results are written as JSON so CI can compare them against a stored baseline. LLM call counts and
+completion rates are compared everywhere; times only where simulated LLM latency dominates them::
+
+    python -m benchmarks.run_benchmarks --output bench_results.json
+    python -m benchmarks.run_benchmarks --quick --baseline benchmarks/baseline.json --max-regression 0.5
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.fixtures import make_pdf, sample_text
+from src.config.setting import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_llm import FakeChatModel
+from src.llm.groq_client import override_llm
+from src.llm.rate_limiter import RateLimiter
+from src.utils import pdf_extractor
+from src.utils.quiz_manager import QuizManager
+
+
+def _summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "p50": round(statistics.median(ordered), 6),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 6),
+        "mean": round(statistics.fmean(ordered), 6),
+    }
+
+
+def _measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _make_generator():
+    generator = QuestionGenerator()
+    # Measure the generation path itself, not cache hits or client-side throttling
+    generator.cache = None
+    generator.rate_limiter = RateLimiter(0, 0)
+    return generator
+
+
+def _calls_per_run(llm, fn, repeat):
+    """Runs ``_measure`` and also returns the mean number of fake LLM calls per run."""
+    before = llm.calls
+    samples = _measure(fn, repeat)
+    return samples, round((llm.calls - before) / repeat, 2)
+
+
+def bench_quiz(llm, sizes, concurrency, source, repeat):
+    results = []
+    for size in sizes:
+        for workers in concurrency:
+            for batch_size in (1, settings.QUESTION_BATCH_SIZE):
+                generator = _make_generator()
+                counts = []
+
+                def run():
+                    questions, _ = QuizManager().collect_questions(
+                        generator, source, "Multiple Choice", "Medium", size,
+                        max_workers=workers, batch_size=batch_size
+                    )
+                    counts.append(len(questions))
+
+                samples, calls = _calls_per_run(llm, run, repeat)
+                results.append({
+                    "name": f"quiz[n={size},workers={workers},batch={batch_size}]",
+                    "params": {"questions": size, "workers": workers, "batch_size": batch_size},
+                    "seconds": _summarize(samples),
+                    "llm_calls": calls,
+                    "questions_per_second": round(sum(counts) / sum(samples), 3),
+                    "completion_rate": round(sum(counts) / (size * repeat), 3),
+                })
+    return results
+
+
+def bench_study_materials(llm, source, num_cards, repeat):
+    generator = _make_generator()
+    results = []
+    for name, fn in (
+        ("summary", lambda: generator.generate_summary(source)),
+        ("summary_stream", lambda: list(generator.stream_summary(source))),
+        ("flashcards", lambda: generator.generate_flashcards(source[:2000], num_cards)),
+    ):
+        samples, calls = _calls_per_run(llm, fn, repeat)
+        results.append({"name": name, "params": {"source_chars": len(source)}, "seconds": _summarize(samples), "llm_calls": calls})
+    return results
+
+
+def bench_pdf(page_counts, repeat):
+    results = []
+    for pages in page_counts:
+        pdf = make_pdf([sample_text(3, seed=i)[:120] for i in range(pages)])
+
+        def run():
+            # Cold extraction every run; the digest cache would otherwise turn repeats into lookups
+            pdf_extractor._text_cache.clear()
+            pdf_extractor.extract_text_from_pdf(pdf)
+
+        results.append({"name": f"pdf_extract[pages={pages}]", "params": {"pages": pages}, "seconds": _summarize(_measure(run, repeat))})
+    return results
+
+
+# Below this many fake LLM calls per run a scenario's time is mostly CPU work (or a single jittered
+# call) and varies between machines too much to gate on
+MIN_TIMED_LLM_CALLS = 5
+
+
+def compare(results, baseline, max_regression):
+    """Returns the scenarios that regressed against ``baseline`` by more than ``max_regression``.
+
+    LLM calls per run and completion rates do not depend on the machine and are checked for every scenario;
+    medians only for scenarios making at least MIN_TIMED_LLM_CALLS calls, whose time is simulated latency.
+    """
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        checks = [("llm_calls", before.get("llm_calls"), result.get("llm_calls"))]
+        if (before.get("llm_calls") or 0) >= MIN_TIMED_LLM_CALLS:
+            checks.append(("p50_seconds", before["seconds"]["p50"], result["seconds"]["p50"]))
+        for metric, old, new in checks:
+            if old and new is not None and new > old * (1 + max_regression):
+                regressions.append({"name": result["name"], "metric": metric, "baseline": old, "value": new, "ratio": round(new / old, 3)})
+        old, new = before.get("completion_rate"), result.get("completion_rate")
+        if old is not None and new is not None and new < old * (1 - max_regression):
+            regressions.append({"name": result["name"], "metric": "completion_rate", "baseline": old, "value": new, "ratio": round(new / old, 3)})
+    return regressions
+
+
+def run(args):
+    fake = FakeChatModel(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate, seed=args.seed)
+    saved = (settings.QUESTION_BANK_ENABLED, settings.BACKOFF_BASE_SECONDS)
+    settings.QUESTION_BANK_ENABLED = False
+    settings.BACKOFF_BASE_SECONDS = args.latency
+    source = sample_text(args.source_sentences, seed=args.seed)
+    try:
+        with override_llm(fake):
+            results = bench_quiz(fake, args.quiz_sizes, args.concurrency, source, args.repeat)
+            results += bench_study_materials(fake, source, args.num_cards, args.repeat)
+        results += bench_pdf(args.pdf_pages, args.repeat)
+    finally:
+        settings.QUESTION_BANK_ENABLED, settings.BACKOFF_BASE_SECONDS = saved
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "config": {
+            "latency": args.latency, "jitter": args.jitter, "failure_rate": args.failure_rate,
+            "seed": args.seed, "repeat": args.repeat, "llm_calls": fake.calls,
+        },
+        "results": results,
+    }
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run StudyAI benchmarks against a fake LLM.")
+    parser.add_argument("--quiz-sizes", type=_int_list, default=[5, 10, 20])
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 8])
+    parser.add_argument("--pdf-pages", type=_int_list, default=[10, 100])
+    parser.add_argument("--num-cards", type=int, default=10)
+    parser.add_argument("--source-sentences", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Small matrix for CI smoke runs")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare medians against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.quiz_sizes, args.concurrency, args.pdf_pages, args.repeat = [5, 10], [1, 4], [10], 3
+        args.source_sentences = 100
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(report["results"], json.load(f), args.max_regression)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for result in report["results"]:
+        print(f"{result['name']:<40} p50={result['seconds']['p50']:.4f}s p95={result['seconds']['p95']:.4f}s")
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['name']} {regression['metric']}: {regression['baseline']} -> {regression['value']}")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Cold-start import profile for the Streamlit app and the API.
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``; the report lists total
+import time, the slowest top-level packages, and whether optional heavy dependencies were loaded::
+
+    python -m benchmarks.startup_profile --output startup_profile.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+ENTRY_POINTS = ("app", "src.api.server")
+DEFERRED_MODULES = ("pandas", "PyPDF2", "langchain_groq", "httpx")
+
+
+def parse_importtime(stderr: str):
+    """Maps each imported module to its cumulative import time in seconds."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative) / 1e6
+    return timings
+
+
+def profile(module: str, top: int = 10):
+    probe = f"import sys, json, {module}; print(json.dumps([m for m in {list(DEFERRED_MODULES)!r} if m in sys.modules]))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], capture_output=True, text=True, check=True)
+    timings = parse_importtime(proc.stderr)
+    packages = {}
+    for name, seconds in timings.items():
+        root = name.split(".")[0]
+        packages[root] = max(packages.get(root, 0.0), seconds)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "import_seconds": round(timings.get(module, 0.0), 4),
+        "slowest_packages": [{"package": name, "seconds": round(seconds, 4)} for name, seconds in slowest],
+        "deferred_modules_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile StudyAI cold-start imports.")
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS))
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default="startup_profile.json")
+    args = parser.parse_args(argv)
+
+    report = [profile(module, args.top) for module in args.modules]
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for entry in report:
+        loaded = ", ".join(entry["deferred_modules_loaded"]) or "none"
+        print(f"{entry['module']:<20} {entry['import_seconds']:.3f}s  deferred modules loaded: {loaded}")
+        for package in entry["slowest_packages"]:
+            print(f"    {package['package']:<24} {package['seconds']:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
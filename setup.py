@@ -6,7 +6,8 @@ with open("requirements.txt") as f:
 setup(
     name="StudyAI",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
     install_requires=requirements,
+    entry_points={"console_scripts": ["studyai-batch=src.generator.batch:main"]},
     author="Nasim"
 )
\ No newline at end of file
@@ -0,0 +1,78 @@
+import threading
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.generator.question_generator import QuestionGenerator
+from src.models.api_schemas import SummaryRequest, FlashcardRequest, QuizRequest, QuizResponse
+from src.models.summary_schema import SummarySchema
+from src.models.flashcard_schema import FlashcardSet
+from src.utils.quiz_manager import QuizManager
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+from src.llm.router import get_model_router
+
+logger = get_logger(__name__)
+
+app = FastAPI(title="Study-AI API")
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_generator() -> QuestionGenerator:
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = QuestionGenerator()
+        return _generator
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return metrics.render_prometheus()
+
+
+@app.get("/routing")
+async def routing():
+    """Model routes, rolling per-model latency/error stats and the most recent routing decisions."""
+    router = get_model_router()
+    if router is None:
+        return {"enabled": False}
+    return {"enabled": True, **router.snapshot()}
+
+
+@app.post("/summary", response_model=SummarySchema)
+async def generate_summary(request: SummaryRequest):
+    try:
+        return await run_in_threadpool(get_generator().generate_summary, request.content)
+    except Exception as e:
+        logger.error("Summary request failed: %s", e)
+        raise HTTPException(status_code=502, detail="Error generating summary")
+
+
+@app.post("/flashcards", response_model=FlashcardSet)
+async def generate_flashcards(request: FlashcardRequest):
+    try:
+        return await run_in_threadpool(get_generator().generate_flashcards, request.content, request.num_cards)
+    except Exception as e:
+        logger.error("Flashcard request failed: %s", e)
+        raise HTTPException(status_code=502, detail="Error generating flashcards")
+
+
+@app.post("/quiz", response_model=QuizResponse)
+async def generate_quiz(request: QuizRequest):
+    questions, errors = await run_in_threadpool(
+        QuizManager().collect_questions,
+        get_generator(), request.content, request.question_type, request.difficulty, request.num_questions
+    )
+    if not questions:
+        logger.error("Quiz request failed: %s", errors)
+        raise HTTPException(status_code=502, detail="Error generating questions")
+    return QuizResponse(questions=[q.to_dict() for q in questions], errors=[str(e) for e in errors])
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+
+
+def question_fingerprint(question_text: str) -> str:
+    normalized = " ".join(question_text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+class QuestionBank:
+    """SQLite store of validated questions, keyed by source digest, question type and difficulty."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.logger = get_logger(self.__class__.__name__)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "bank_key TEXT NOT NULL, fingerprint TEXT NOT NULL, payload TEXT NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (bank_key, fingerprint))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS demand (bank_key TEXT PRIMARY KEY, requests INTEGER NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(source: str, question_type: str, difficulty: str) -> str:
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return f"{digest}:{question_type}:{difficulty.lower()}"
+
+    def add(self, bank_key: str, questions: Iterable[BaseModel]) -> int:
+        """Stores questions, skipping ones already banked under the same key; returns how many were new."""
+        rows = [(bank_key, question_fingerprint(q.question), json.dumps(q.model_dump()), time.time()) for q in questions]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def sample(self, bank_key: str, schema, n: int, exclude: Iterable[str] = ()) -> List[BaseModel]:
+        exclude = set(exclude)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint, payload FROM questions WHERE bank_key = ? ORDER BY RANDOM() LIMIT ?",
+                (bank_key, n + len(exclude)),
+            ).fetchall()
+        return [schema.model_validate(json.loads(payload)) for fp, payload in rows if fp not in exclude][:n]
+
+    def record_request(self, bank_key: str) -> int:
+        """Counts a quiz request for ``bank_key``; returns how many have been made so far."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO demand VALUES (?, 1) ON CONFLICT(bank_key) DO UPDATE SET requests = requests + 1", (bank_key,)
+            )
+            self._conn.commit()
+            return self._conn.execute("SELECT requests FROM demand WHERE bank_key = ?", (bank_key,)).fetchone()[0]
+
+    def count(self, bank_key: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM questions WHERE bank_key = ?", (bank_key,)).fetchone()[0]
+
+
+class QuestionBankPrefiller:
+    """Background worker topping banks up to a target size ahead of demand.
+
+    Prefill calls share the rate limiter with foreground requests, so callers only schedule
+    sources that have been requested repeatedly (QUESTION_BANK_PREFILL_MIN_REQUESTS).
+    """
+
+    def __init__(self, bank: QuestionBank, target: int):
+        self.bank = bank
+        self.target = target
+        self.logger = get_logger(self.__class__.__name__)
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="question-bank-prefill", daemon=True)
+        self._thread.start()
+
+    def schedule(self, bank_key: str, produce: Callable[[int], List[BaseModel]]) -> bool:
+        """Queues a top-up for ``bank_key``; ``produce(count)`` must return up to ``count`` validated questions."""
+        with self._lock:
+            if bank_key in self._pending:
+                return False
+            self._pending.add(bank_key)
+        self._queue.put((bank_key, produce))
+        return True
+
+    def _run(self):
+        while True:
+            bank_key, produce = self._queue.get()
+            try:
+                missing = self.target - self.bank.count(bank_key)
+                if missing > 0:
+                    added = self.bank.add(bank_key, produce(missing))
+                    self.logger.info("Prefilled %s questions for bank %s", added, bank_key[:12])
+            except Exception as e:
+                self.logger.error("Question bank prefill failed: %s", e)
+            finally:
+                with self._lock:
+                    self._pending.discard(bank_key)
+                self._queue.task_done()
+
+    def join(self):
+        self._queue.join()
+
+
+_bank = None
+_prefiller = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> Optional[QuestionBank]:
+    global _bank
+    if not settings.QUESTION_BANK_ENABLED:
+        return None
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank(settings.QUESTION_BANK_PATH)
+        return _bank
+
+
+def get_prefiller() -> Optional[QuestionBankPrefiller]:
+    global _prefiller
+    bank = get_question_bank()
+    if bank is None or settings.QUESTION_BANK_TARGET <= 0:
+        return None
+    with _bank_lock:
+        if _prefiller is None:
+            _prefiller = QuestionBankPrefiller(bank, settings.QUESTION_BANK_TARGET)
+        return _prefiller
@@ -0,0 +1,116 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+from src.config.setting import settings
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+
+
+def encode_state(state: dict) -> bytes:
+    return zlib.compress(json.dumps(state, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_state(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class SQLiteSessionStore:
+    """Compressed session snapshots in a local SQLite file; sessions idle past ``idle_seconds`` are evicted."""
+
+    def __init__(self, path: str, idle_seconds: Optional[float] = None, clock=time.time):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data, updated FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            if self.idle_seconds and self.clock() - row[1] > self.idle_seconds:
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE sessions SET updated = ? WHERE session_id = ?", (self.clock(), session_id))
+            self._conn.commit()
+        return decode_state(row[0])
+
+    def save(self, session_id: str, state: dict):
+        with self._lock:
+            now = self.clock()
+            self._conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", (session_id, encode_state(state), now))
+            if self.idle_seconds:
+                self._conn.execute("DELETE FROM sessions WHERE updated < ?", (now - self.idle_seconds,))
+            self._conn.commit()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class RedisSessionStore:
+    """Session snapshots in Redis (or any client with get/set/expire/delete), evicted by key expiry."""
+
+    def __init__(self, client, idle_seconds: Optional[float] = None, prefix: str = "studyai:session:"):
+        self.client = client
+        self.idle_seconds = int(idle_seconds) if idle_seconds else None
+        self.prefix = prefix
+
+    def load(self, session_id: str) -> Optional[dict]:
+        key = self.prefix + session_id
+        data = self.client.get(key)
+        if data is None:
+            return None
+        if self.idle_seconds:
+            self.client.expire(key, self.idle_seconds)
+        return decode_state(data)
+
+    def save(self, session_id: str, state: dict):
+        self.client.set(self.prefix + session_id, encode_state(state), ex=self.idle_seconds)
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Process-wide session store selected by SESSION_STORE ("sqlite" or "redis"), or None to keep sessions in memory."""
+    global _session_store
+    backend = settings.SESSION_STORE
+    if not backend:
+        return None
+    with _session_store_lock:
+        if _session_store is None:
+            if backend == "sqlite":
+                _session_store = SQLiteSessionStore(settings.SESSION_STORE_PATH, settings.SESSION_IDLE_SECONDS)
+            elif backend == "redis":
+                try:
+                    import redis
+                except ImportError as e:
+                    raise CustomException("SESSION_STORE=redis requires the 'redis' package", e)
+                _session_store = RedisSessionStore(redis.Redis.from_url(settings.SESSION_REDIS_URL), settings.SESSION_IDLE_SECONDS)
+            else:
+                raise CustomException(f"Unknown SESSION_STORE backend: {backend}")
+            get_logger(__name__).info("Using %s session store", backend)
+        return _session_store
@@ -0,0 +1,82 @@
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from src.config.setting import settings
+from src.common.custom_exception import CustomException
+from src.common.metrics import metrics
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls with the same key: one leader runs, everyone else waits for its result."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key: str) -> Tuple[_Call, bool]:
+        """Returns the in-flight call for ``key`` and whether the caller is its leader (and must ``finish`` it)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                metrics.inc("studyai_coalesced_calls_total", help="LLM calls served by an identical in-flight call")
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key: str, call: _Call, result: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.event.set()
+
+    @staticmethod
+    def wait(call: _Call, timeout: Optional[float] = None) -> Any:
+        """Blocks until the leader finishes, for at most ``timeout`` seconds (SINGLE_FLIGHT_WAIT_SECONDS by default)."""
+        if not call.event.wait(timeout or settings.SINGLE_FLIGHT_WAIT_SECONDS):
+            raise CustomException("Timed out waiting for a coalesced LLM call")
+        if call.error is not None:
+            raise CustomException("Coalesced LLM call failed", call.error)
+        return call.result
+
+    def do(self, key: str, fn: Callable, *args) -> Any:
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call)
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": in_flight}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide instance, so identical requests from different Streamlit sessions share one LLM call."""
+    return _single_flight
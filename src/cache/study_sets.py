@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import IO, Dict, Iterable, Iterator, Optional
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+from src.prompts.budget import normalize_source
+from src.utils.quiz_manager import QuizManager
+
+
+def source_digest(source: str) -> str:
+    """Digest of the normalized source, so re-extracted or re-pasted copies of one document share sets."""
+    return hashlib.sha256(normalize_source(source).encode("utf-8")).hexdigest()
+
+
+def study_set_key(source: str, question_type: str, difficulty: str) -> str:
+    return f"{source_digest(source)}:{question_type}:{difficulty.lower()}"
+
+
+STUDY_SET_FIELDS = ("key", "title", "question_type", "difficulty")
+
+
+def study_set_meta(source: str, question_type: str, difficulty: str, title: Optional[str] = None) -> dict:
+    """Identifying fields of a study set; the source itself is not exported, only its digest."""
+    return {
+        "key": study_set_key(source, question_type, difficulty),
+        "title": title or " ".join(source.split())[:80],
+        "question_type": question_type,
+        "difficulty": difficulty,
+    }
+
+
+def make_study_set(meta: dict, quiz_manager: QuizManager) -> dict:
+    """One exportable record: ``meta`` plus the quiz manager's summary, flashcards, questions and results."""
+    return {**meta, "created": time.time(), "quiz_manager": quiz_manager.to_state()}
+
+
+def dumps_study_set(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_study_sets(records: Iterable[dict], path: str, append: bool = True) -> int:
+    """Streams records to a JSON Lines file (gzip-compressed for ``.gz`` paths); returns how many were written."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    with _open(path, "a" if append else "w") as f:
+        for record in records:
+            f.write(dumps_study_set(record) + "\n")
+            count += 1
+    return count
+
+
+def iter_study_sets(source) -> Iterator[dict]:
+    """Lazily reads records from a JSON Lines path, text stream or uploaded bytes; blank lines are skipped."""
+    if isinstance(source, str):
+        with _open(source, "r") as f:
+            yield from iter_study_sets(f)
+        return
+    if isinstance(source, bytes):
+        source = io.StringIO(gzip.decompress(source).decode("utf-8") if source[:2] == b"\x1f\x8b" else source.decode("utf-8"))
+    for line in source:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def validate_study_set(record) -> dict:
+    """Returns ``record`` if it has a study set's shape; raises ValueError for foreign or truncated records."""
+    if not isinstance(record, dict) or not all(isinstance(record.get(field), str) for field in STUDY_SET_FIELDS):
+        raise ValueError(f"record is missing one of {', '.join(STUDY_SET_FIELDS)}")
+    state = record.get("quiz_manager")
+    if not isinstance(state, dict) or not all(isinstance(state.get(f), list) for f in ("questions", "user_answers", "results", "flashcards")):
+        raise ValueError("record has no quiz materials")
+    return record
+
+
+class StudySetLibrary:
+    """Pre-generated study sets indexed by key; matching requests are served without any LLM call.
+
+    The whole file is indexed at start-up and the newest record per key wins.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._sets: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            for record in iter_study_sets(path):
+                self._sets[record["key"]] = record
+        get_logger(self.__class__.__name__).info("Loaded %s study sets from %s", len(self._sets), path)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sets)
+
+    def find(self, source: str, question_type: str, difficulty: str, num_questions: int, num_cards: int) -> Optional[dict]:
+        """A set with at least as many questions and flashcards as requested, if one exists."""
+        with self._lock:
+            record = self._sets.get(study_set_key(source, question_type, difficulty))
+        if record is None:
+            return None
+        state = record["quiz_manager"]
+        if len(state["questions"]) < num_questions or len(state["flashcards"]) < num_cards:
+            return None
+        return record
+
+    def add(self, record: dict):
+        write_study_sets([record], self.path)
+        with self._lock:
+            self._sets[record["key"]] = record
+
+
+def load_study_set(record: dict, num_questions: Optional[int] = None, num_cards: Optional[int] = None,
+                   with_results: bool = True) -> QuizManager:
+    """QuizManager holding a record's materials, trimmed to the requested counts.
+
+    Without ``with_results`` the quiz starts fresh, as when a pre-generated set is served to a new student.
+    Raises ValueError (pydantic's ValidationError included) when the record's contents are malformed.
+    """
+    state = dict(record["quiz_manager"])
+    state["questions"] = state["questions"][:num_questions]
+    state["flashcards"] = state["flashcards"][:num_cards]
+    if not with_results:
+        state.update(user_answers=[], results=[], score=None)
+    try:
+        return QuizManager.from_state(state)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"malformed study set: {e!r}") from e
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def get_study_set_library() -> Optional[StudySetLibrary]:
+    """Process-wide library read from STUDY_SET_LIBRARY_PATH, or None when no path is configured."""
+    global _library
+    if not settings.STUDY_SET_LIBRARY_PATH:
+        return None
+    with _library_lock:
+        if _library is None:
+            _library = StudySetLibrary(settings.STUDY_SET_LIBRARY_PATH)
+        return _library
@@ -1,21 +1,101 @@
+import atexit
+import json
 import logging
 import os
-import sys
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 
-LOGS_DIR = "logs"
-os.makedirs(LOGS_DIR, exist_ok=True)
+from src.config.setting import settings
 
-LOG_FILE = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+_listener = None
+_queue = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Root handler that starts the writer thread on the first record, so importing modules has no side effects."""
+
+    def emit(self, record):
+        if _listener is None:
+            configure_logging()
+        super().emit(record)
+
+    # The queue never leaves the process, so message formatting is left to the writer thread
+    def prepare(self, record):
+        return record
+
+
+def _build_file_handler():
+    os.makedirs(settings.LOG_DIR, exist_ok=True)
+    path = os.path.join(settings.LOG_DIR, f"log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+    if settings.LOG_ROTATE_WHEN:
+        handler = TimedRotatingFileHandler(path, when=settings.LOG_ROTATE_WHEN, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    else:
+        handler = RotatingFileHandler(path, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    handler.setFormatter(JsonFormatter() if settings.LOG_JSON else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def _install_queue_handler():
+    global _queue
+    root = logging.getLogger()
+    if _queue is None:
+        _queue = queue.SimpleQueue()
+        root.setLevel(settings.LOG_LEVEL)
+        root.addHandler(_DeferredQueueHandler(_queue))
+    return _queue
+
+
+def configure_logging(handler=None):
+    """Routes all records through an in-memory queue to a background writer thread; idempotent.
+
+    Callers only enqueue the record, so disk writes and formatting never block request threads.
+    """
+    global _listener
+    with _lock:
+        if _listener is None:
+            _listener = QueueListener(_install_queue_handler(), handler or _build_file_handler(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Drains the queue, stops the writer thread and detaches the root handler."""
+    global _listener, _queue
+    with _lock:
+        listener, _listener, _queue = _listener, None, None
+        root = logging.getLogger()
+        for handler in [h for h in root.handlers if isinstance(h, _DeferredQueueHandler)]:
+            root.removeHandler(handler)
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    level=logging.DEBUG,
-)
 
 def get_logger(name):
-    logger=logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    return logger
-    
\ No newline at end of file
+    with _lock:
+        _install_queue_handler()
+    return logging.getLogger(name)
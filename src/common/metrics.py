@@ -0,0 +1,149 @@
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config.setting import settings
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+trace_logger = logging.getLogger("studyai.trace")
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Minimal thread-safe counters and histograms with Prometheus text exposition."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, help: str = "", **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._help.setdefault(name, (help, "counter"))
+
+    def observe(self, name: str, value: float, help: str = "", **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+            self._help.setdefault(name, (help, "histogram"))
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            families = {}
+            for (name, key), value in self._counters.items():
+                families.setdefault(name, []).append(f"{name}{_format_labels(key)} {value}")
+            for (name, key), h in self._histograms.items():
+                samples = families.setdefault(name, [])
+                for bound, count in zip(self.buckets, h["buckets"]):
+                    samples.append(f"{name}_bucket{_format_labels(key, (('le', bound),))} {count}")
+                samples.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {h['count']}")
+                samples.append(f"{name}_sum{_format_labels(key)} {h['sum']}")
+                samples.append(f"{name}_count{_format_labels(key)} {h['count']}")
+            for name in sorted(families):
+                help_text, kind = self._help.get(name, ("", "untyped"))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(sorted(families[name]))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+@contextmanager
+def timed(stage: str, **attributes):
+    """Records wall time of the block in ``studyai_stage_duration_seconds`` and emits an optional JSON trace span."""
+    span = {"span_id": uuid.uuid4().hex[:16], "stage": stage, **attributes}
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield span
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("studyai_stage_duration_seconds", elapsed, help="Wall time per pipeline stage", stage=stage, status=status)
+        if settings.TRACE_SPANS_ENABLED:
+            span.update(duration_ms=round(elapsed * 1000, 2), status=status, start=time.time() - elapsed)
+            trace_logger.info(json.dumps(span, default=str))
+
+
+def traced(stage: str):
+    """Decorator form of ``timed``; generator functions are timed until they are exhausted."""
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                with timed(stage):
+                    yield from fn(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Serves /metrics from a daemon thread, for processes (like Streamlit) without their own HTTP routes."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -6,7 +6,72 @@ load_dotenv()
 class Settings():
     GROQ_API_KEY=os.getenv("GROQ_API_KEY")
     MODEL_NAME="llama-3.3-70b-versatile"
+    FAST_MODEL_NAME=os.getenv("FAST_MODEL_NAME", "llama-3.1-8b-instant")
+    MODEL_ROUTING_ENABLED=os.getenv("MODEL_ROUTING_ENABLED", "true").lower()=="true"
+    MODEL_ROUTES=os.getenv("MODEL_ROUTES")
+    HEDGE_AFTER_SECONDS=float(os.getenv("HEDGE_AFTER_SECONDS", "10"))
+    ROUTER_WINDOW=int(os.getenv("ROUTER_WINDOW", "50"))
+    ROUTER_MAX_ERROR_RATE=float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5"))
     TEMPERATURE=0.9
     MAX_RETRIES=3
+    PROMPT_INPUT_TOKENS=int(os.getenv("PROMPT_INPUT_TOKENS", "3000"))
+    FLASHCARD_INPUT_TOKENS=int(os.getenv("FLASHCARD_INPUT_TOKENS", "800"))
+    PROMPT_OUTPUT_TOKENS=int(os.getenv("PROMPT_OUTPUT_TOKENS", "2048"))
+    RATE_LIMIT_RPM=int(os.getenv("RATE_LIMIT_RPM", "30"))
+    RATE_LIMIT_TPM=int(os.getenv("RATE_LIMIT_TPM", "12000"))
+    RATE_LIMIT_COMPLETION_TOKENS=int(os.getenv("RATE_LIMIT_COMPLETION_TOKENS", "512"))
+    BACKOFF_BASE_SECONDS=float(os.getenv("BACKOFF_BASE_SECONDS", "1"))
+    BACKOFF_MAX_SECONDS=float(os.getenv("BACKOFF_MAX_SECONDS", "30"))
+    REQUEST_TIMEOUT=float(os.getenv("REQUEST_TIMEOUT", "60"))
+    CONNECT_TIMEOUT=float(os.getenv("CONNECT_TIMEOUT", "5"))
+    HTTP_MAX_CONNECTIONS=int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    LOG_LEVEL=os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_DIR=os.getenv("LOG_DIR", "logs")
+    LOG_JSON=os.getenv("LOG_JSON", "false").lower()=="true"
+    LOG_MAX_BYTES=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT=int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_ROTATE_WHEN=os.getenv("LOG_ROTATE_WHEN", "")
+    METRICS_PORT=int(os.getenv("METRICS_PORT", "0"))
+    TRACE_SPANS_ENABLED=os.getenv("TRACE_SPANS_ENABLED", "false").lower()=="true"
+    QUESTION_CONCURRENCY=int(os.getenv("QUESTION_CONCURRENCY", "4"))
+    QUESTION_BATCH_SIZE=int(os.getenv("QUESTION_BATCH_SIZE", "10"))
+    SINGLE_FLIGHT_WAIT_SECONDS=float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "300"))
+    CACHE_ENABLED=os.getenv("CACHE_ENABLED", "true").lower()=="true"
+    CACHE_BYPASS=os.getenv("CACHE_BYPASS", "false").lower()=="true"
+    CACHE_MAX_ENTRIES=int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    CACHE_TTL_SECONDS=int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    CACHE_DISK_PATH=os.getenv("CACHE_DISK_PATH")
+    CACHE_DISK_MAX_ENTRIES=int(os.getenv("CACHE_DISK_MAX_ENTRIES", "10000"))
+    CACHE_DISK_TTL_SECONDS=int(os.getenv("CACHE_DISK_TTL_SECONDS", "604800"))
+    PDF_MAX_FILE_BYTES=int(os.getenv("PDF_MAX_FILE_BYTES", str(25 * 1024 * 1024)))
+    PDF_MAX_PAGES=int(os.getenv("PDF_MAX_PAGES", "200"))
+    PDF_MAX_CHARS=int(os.getenv("PDF_MAX_CHARS", "500000"))
+    PDF_PARALLEL_MIN_PAGES=int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))
+    PDF_PROCESS_WORKERS=int(os.getenv("PDF_PROCESS_WORKERS", "2"))
+    PDF_TEXT_CACHE_ENTRIES=int(os.getenv("PDF_TEXT_CACHE_ENTRIES", "32"))
+    CHUNK_TOKENS=int(os.getenv("CHUNK_TOKENS", "1000"))
+    CHUNK_OVERLAP_TOKENS=int(os.getenv("CHUNK_OVERLAP_TOKENS", "100"))
+    SUMMARY_MAX_CHUNKS=int(os.getenv("SUMMARY_MAX_CHUNKS", "12"))
+    SUMMARY_MAX_FANOUT=int(os.getenv("SUMMARY_MAX_FANOUT", "8"))
+    QUESTION_BANK_ENABLED=os.getenv("QUESTION_BANK_ENABLED", "false").lower()=="true"
+    QUESTION_BANK_PATH=os.getenv("QUESTION_BANK_PATH", os.path.join("data", "question_bank.db"))
+    QUESTION_BANK_TARGET=int(os.getenv("QUESTION_BANK_TARGET", "40"))
+    QUESTION_BANK_PREFILL_MIN_REQUESTS=int(os.getenv("QUESTION_BANK_PREFILL_MIN_REQUESTS", "3"))
+    DEDUP_SIMILARITY_THRESHOLD=float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.85"))
+    RETRIEVAL_CHUNK_TOKENS=int(os.getenv("RETRIEVAL_CHUNK_TOKENS", "300"))
+    SESSION_STORE=os.getenv("SESSION_STORE", "sqlite").lower()
+    SESSION_STORE_PATH=os.getenv("SESSION_STORE_PATH", os.path.join("data", "sessions.db"))
+    SESSION_REDIS_URL=os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    SESSION_IDLE_SECONDS=int(os.getenv("SESSION_IDLE_SECONDS", "7200"))
+    STUDY_SET_LIBRARY_PATH=os.getenv("STUDY_SET_LIBRARY_PATH", os.path.join("data", "study_sets.jsonl"))
+    JOB_STORE=os.getenv("JOB_STORE", "sqlite").lower()
+    JOB_REDIS_URL=os.getenv("JOB_REDIS_URL", os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0"))
+    JOB_STORE_PATH=os.getenv("JOB_STORE_PATH", os.path.join("data", "jobs.db"))
+    JOB_WORKERS=int(os.getenv("JOB_WORKERS", "4"))
+    JOB_POLL_SECONDS=float(os.getenv("JOB_POLL_SECONDS", "0.5"))
+    JOB_STALE_SECONDS=float(os.getenv("JOB_STALE_SECONDS", "90"))
+    JOB_RETENTION_SECONDS=int(os.getenv("JOB_RETENTION_SECONDS", "86400"))
     
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Generates study sets for many topics concurrently and appends them to a JSON Lines file::
+
+    python -m src.generator.batch topics.txt --output data/study_sets.jsonl --concurrency 4
+
+Each input line is a topic (or a block of notes on one line), or a JSON object with a "topic" and
+optional "title", "question_type", "difficulty", "num_questions" and "num_cards" overrides. Sets
+already in the output file are skipped, so an interrupted run can simply be started again. Point
+STUDY_SET_LIBRARY_PATH at the output to serve these sets in the app without any LLM call.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from src.cache.study_sets import iter_study_sets, make_study_set, study_set_meta, write_study_sets
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.generator.question_generator import QuestionGenerator
+from src.generator.study_pipeline import StudyMaterialPipeline
+from src.utils.quiz_manager import QuizManager
+
+logger = get_logger(__name__)
+
+
+def read_requests(path: str, defaults: dict) -> List[dict]:
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            request = json.loads(line) if line.startswith("{") else {"topic": line}
+            requests.append({**defaults, **request})
+    return requests
+
+
+def generate_study_set(generator: QuestionGenerator, request: dict) -> dict:
+    """Runs the full pipeline for one request; any failed stage fails the whole set."""
+    quiz_manager = QuizManager()
+    pipeline = StudyMaterialPipeline(generator, quiz_manager, stream=False)
+    for _ in pipeline.run(request["topic"], request["question_type"], request["difficulty"],
+                          request["num_questions"], request["num_cards"]):
+        pass
+    if pipeline.errors:
+        raise CustomException(f"Stages failed: {', '.join(sorted(pipeline.errors))}", next(iter(pipeline.errors.values())))
+    meta = study_set_meta(request["topic"], request["question_type"], request["difficulty"], request.get("title"))
+    return make_study_set(meta, quiz_manager)
+
+
+def run_batch(requests: List[dict], output: str, concurrency: int,
+              generator: Optional[QuestionGenerator] = None) -> Tuple[int, int]:
+    """Generates every request whose set is not in ``output`` yet, writing each as it finishes; returns (written, failed)."""
+    done = {record["key"] for record in iter_study_sets(output)} if os.path.exists(output) else set()
+    pending = {}
+    for request in requests:
+        key = study_set_meta(request["topic"], request["question_type"], request["difficulty"])["key"]
+        if key not in done:
+            pending.setdefault(key, request)
+    logger.info("Generating %s study sets (%s already in %s)", len(pending), len(requests) - len(pending), output)
+
+    generator = generator or QuestionGenerator()
+    written = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(generate_study_set, generator, request): request for request in pending.values()}
+        for future in as_completed(futures):
+            request = futures[future]
+            try:
+                write_study_sets([future.result()], output)
+                written += 1
+            except Exception as e:
+                failed += 1
+                logger.error("Study set for %r failed: %s", request["topic"][:80], e)
+    return written, failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate StudyAI study sets for many topics.")
+    parser.add_argument("input", help="File with one topic or JSON request per line")
+    parser.add_argument("--output", default=os.path.join("data", "study_sets.jsonl"), help="JSON Lines output, gzip-compressed if it ends in .gz")
+    parser.add_argument("--concurrency", type=int, default=4, help="Topics generated at the same time")
+    parser.add_argument("--question-type", default="Multiple Choice", choices=["Multiple Choice", "Fill in the Blank"])
+    parser.add_argument("--difficulty", default="Medium", choices=["Easy", "Medium", "Hard"])
+    parser.add_argument("--num-questions", type=int, default=10)
+    parser.add_argument("--num-cards", type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    defaults = {"question_type": args.question_type, "difficulty": args.difficulty,
+                "num_questions": args.num_questions, "num_cards": args.num_cards}
+    written, failed = run_batch(read_requests(args.input, defaults), args.output, args.concurrency)
+    print(f"Wrote {written} study sets to {args.output}, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from src.config.setting import settings
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.generator.question_generator import QuestionGenerator
+from src.generator.study_pipeline import StudyMaterialPipeline
+from src.models.flashcard_schema import Flashcard
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion
+from src.models.summary_schema import SummarySchema
+from src.utils.quiz_manager import QuizManager
+
+
+@dataclass
+class GenerationJob:
+    job_id: str
+    params: dict
+    status: str
+    stages: Dict[str, dict]
+    questions: List[dict]
+    progress: float
+    updated: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def stage_status(self, stage: str) -> Optional[str]:
+        return self.stages.get(stage, {}).get("status")
+
+    def quiz_complete(self) -> bool:
+        return len(self.questions) >= self.params["num_questions"]
+
+
+def split_source(params: dict):
+    """Job params with the source text replaced by its digest, plus (digest, text) to store once.
+
+    Watchers poll job records every JOB_POLL_SECONDS, so the source (up to PDF_MAX_CHARS) is kept out of them.
+    """
+    if "topic" not in params:
+        return params, None, None
+    topic = params["topic"]
+    digest = hashlib.sha256(topic.encode("utf-8")).hexdigest()
+    return {**{k: v for k, v in params.items() if k != "topic"}, "source_digest": digest}, digest, topic
+
+
+class JobStore:
+    """SQLite record of each generation job; every finished stage and accepted question is written as it lands."""
+
+    def __init__(self, path: str, retention_seconds: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.retention_seconds = retention_seconds
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, params TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress REAL NOT NULL, updated REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS job_stages (job_id TEXT NOT NULL, stage TEXT NOT NULL, status TEXT NOT NULL, "
+            "value TEXT, error TEXT, PRIMARY KEY (job_id, stage));"
+            "CREATE TABLE IF NOT EXISTS job_questions (job_id TEXT NOT NULL, position INTEGER NOT NULL, payload TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, position));"
+            "CREATE TABLE IF NOT EXISTS job_sources (digest TEXT PRIMARY KEY, text TEXT NOT NULL, updated REAL NOT NULL);"
+        )
+        self._conn.commit()
+
+    def create(self, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        params, digest, source = split_source(params)
+        with self._lock:
+            now = time.time()
+            if digest:
+                self._conn.execute("INSERT OR REPLACE INTO job_sources VALUES (?, ?, ?)", (digest, source, now))
+            self._conn.execute("INSERT INTO jobs VALUES (?, ?, 'queued', 0, ?)", (job_id, json.dumps(params), now))
+            if self.retention_seconds:
+                expired = "SELECT job_id FROM jobs WHERE updated < ?"
+                cutoff = (now - self.retention_seconds,)
+                self._conn.execute(f"DELETE FROM job_stages WHERE job_id IN ({expired})", cutoff)
+                self._conn.execute(f"DELETE FROM job_questions WHERE job_id IN ({expired})", cutoff)
+                self._conn.execute("DELETE FROM jobs WHERE updated < ?", cutoff)
+                self._conn.execute("DELETE FROM job_sources WHERE updated < ?", cutoff)
+            self._conn.commit()
+        return job_id
+
+    def get_source(self, digest: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM job_sources WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE job_sources SET updated = ? WHERE digest = ?", (time.time(), digest))
+                self._conn.commit()
+        return row[0] if row else None
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            row = self._conn.execute("SELECT params, status, progress, updated FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            stages = self._conn.execute("SELECT stage, status, value, error FROM job_stages WHERE job_id = ?", (job_id,)).fetchall()
+            questions = self._conn.execute(
+                "SELECT payload FROM job_questions WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return GenerationJob(
+            job_id=job_id,
+            params=json.loads(row[0]),
+            status=row[1],
+            stages={stage: {"status": status, "value": json.loads(value) if value else None, "error": error}
+                    for stage, status, value, error in stages},
+            questions=[json.loads(payload) for (payload,) in questions],
+            progress=row[2],
+            updated=row[3],
+        )
+
+    def _touch(self, job_id: str, **fields):
+        assignments = "".join(f", {name} = ?" for name in fields)
+        self._conn.execute(f"UPDATE jobs SET updated = ?{assignments} WHERE job_id = ?", (time.time(), *fields.values(), job_id))
+
+    def set_status(self, job_id: str, status: str):
+        with self._lock:
+            self._touch(job_id, status=status)
+            self._conn.commit()
+
+    def set_progress(self, job_id: str, progress: float):
+        with self._lock:
+            self._touch(job_id, progress=progress)
+            self._conn.commit()
+
+    def set_stage(self, job_id: str, stage: str, status: str, value=None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_stages VALUES (?, ?, ?, ?, ?)",
+                (job_id, stage, status, json.dumps(value) if value is not None else None, error),
+            )
+            self._touch(job_id)
+            self._conn.commit()
+
+    def add_questions(self, job_id: str, payloads: List[dict]):
+        with self._lock:
+            start = self._conn.execute("SELECT COUNT(*) FROM job_questions WHERE job_id = ?", (job_id,)).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO job_questions VALUES (?, ?, ?)",
+                [(job_id, start + i, json.dumps(payload)) for i, payload in enumerate(payloads)],
+            )
+            self._touch(job_id)
+            self._conn.commit()
+
+
+def _text(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisJobStore:
+    """Jobs in Redis, so any replica can watch a job or resume it after the pod running it went away.
+
+    Same interface as ``JobStore``; a job's keys expire ``retention_seconds`` after its last update.
+    """
+
+    def __init__(self, client, retention_seconds: Optional[float] = None, prefix: str = "studyai:job:"):
+        self.client = client
+        self.retention_seconds = int(retention_seconds) if retention_seconds else None
+        self.prefix = prefix
+
+    def _keys(self, job_id: str):
+        base = self.prefix + job_id
+        return base, base + ":stages", base + ":questions"
+
+    def _touch(self, job_id: str, **fields):
+        self.client.hset(self._keys(job_id)[0], mapping={"updated": time.time(), **fields})
+        if self.retention_seconds:
+            for key in self._keys(job_id):
+                self.client.expire(key, self.retention_seconds)
+
+    def _source_key(self, digest: str) -> str:
+        # Shared by every job on the same source
+        return f"{self.prefix}source:{digest}"
+
+    def create(self, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        params, digest, source = split_source(params)
+        if digest:
+            self.client.set(self._source_key(digest), source, ex=self.retention_seconds)
+        self._touch(job_id, params=json.dumps(params), status="queued", progress=0)
+        return job_id
+
+    def get_source(self, digest: str) -> Optional[str]:
+        key = self._source_key(digest)
+        source = self.client.get(key)
+        if source is not None and self.retention_seconds:
+            self.client.expire(key, self.retention_seconds)
+        return _text(source) if source is not None else None
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        job_key, stages_key, questions_key = self._keys(job_id)
+        row = {_text(k): _text(v) for k, v in self.client.hgetall(job_key).items()}
+        if not row:
+            return None
+        return GenerationJob(
+            job_id=job_id,
+            params=json.loads(row["params"]),
+            status=row["status"],
+            stages={_text(stage): json.loads(info) for stage, info in self.client.hgetall(stages_key).items()},
+            questions=[json.loads(payload) for payload in self.client.lrange(questions_key, 0, -1)],
+            progress=float(row["progress"]),
+            updated=float(row["updated"]),
+        )
+
+    def set_status(self, job_id: str, status: str):
+        self._touch(job_id, status=status)
+
+    def set_progress(self, job_id: str, progress: float):
+        self._touch(job_id, progress=progress)
+
+    def set_stage(self, job_id: str, stage: str, status: str, value=None, error: Optional[str] = None):
+        self.client.hset(self._keys(job_id)[1], stage, json.dumps({"status": status, "value": value, "error": error}))
+        self._touch(job_id)
+
+    def add_questions(self, job_id: str, payloads: List[dict]):
+        if payloads:
+            self.client.rpush(self._keys(job_id)[2], *(json.dumps(payload) for payload in payloads))
+        self._touch(job_id)
+
+
+def _dump(value):
+    if isinstance(value, list):
+        return [item.model_dump() for item in value]
+    return value.model_dump()
+
+
+def run_generation_job(store, job_id: str, generator_factory: Callable = QuestionGenerator):
+    """Runs (or resumes) a job: stages already done are skipped and persisted questions count towards the quiz."""
+    job = store.get(job_id)
+    params = job.params
+    topic = store.get_source(params["source_digest"]) if "source_digest" in params else params.get("topic")
+    if topic is None:
+        get_logger(__name__).error("Job %s failed: its source has expired", job_id)
+        store.set_status(job_id, "failed")
+        return
+    schema = MCQQuestion if params["question_type"] == "Multiple Choice" else FillBlankQuestion
+    skip = [stage for stage in ("summary", "flashcards") if job.stage_status(stage) == "done"]
+    if job.quiz_complete():
+        skip.append("quiz")
+
+    store.set_status(job_id, "running")
+    partial_written = {}
+    try:
+        pipeline = StudyMaterialPipeline(generator_factory(), QuizManager())
+        events = pipeline.run(
+            topic, params["question_type"], params["difficulty"], params["num_questions"], params["num_cards"],
+            flashcard_topic=params.get("flashcard_topic"), skip=skip,
+            existing_questions=[schema.model_validate(q) for q in job.questions],
+            on_questions=lambda questions: store.add_questions(job_id, [q.model_dump() for q in questions]),
+        )
+        for event in events:
+            if event.status == "progress":
+                store.set_progress(job_id, event.value)
+            elif event.status == "error":
+                store.set_stage(job_id, event.stage, "error", error=str(event.error))
+            elif event.stage == "quiz":
+                # Questions were persisted one batch at a time through on_questions
+                store.set_stage(job_id, "quiz", "done")
+            elif event.status == "partial":
+                # Watchers only see one value per poll, so streamed partials are written at that pace;
+                # the final value arrives as a "done" event and is always written
+                now = time.monotonic()
+                if now - partial_written.get(event.stage, float("-inf")) >= settings.JOB_POLL_SECONDS:
+                    partial_written[event.stage] = now
+                    store.set_stage(job_id, event.stage, event.status, _dump(event.value))
+            else:
+                store.set_stage(job_id, event.stage, event.status, _dump(event.value))
+    except Exception as e:
+        get_logger(__name__).error("Job %s failed: %s", job_id, e)
+
+    job = store.get(job_id)
+    complete = all(job.stage_status(stage) == "done" for stage in ("summary", "flashcards")) and job.quiz_complete()
+    store.set_status(job_id, "done" if complete else "failed")
+
+
+def apply_job(job: GenerationJob, quiz_manager: QuizManager):
+    """Loads whatever a job produced into ``quiz_manager``; returns True if any stage has a result."""
+    summary = job.stages.get("summary", {})
+    flashcards = job.stages.get("flashcards", {})
+    schema = MCQQuestion if job.params["question_type"] == "Multiple Choice" else FillBlankQuestion
+
+    quiz_manager.summary = SummarySchema.model_validate(summary["value"]) if summary.get("status") == "done" else None
+    quiz_manager.flashcards = [Flashcard.model_validate(card) for card in flashcards["value"]] if flashcards.get("status") == "done" else []
+    quiz_manager.questions = [
+        QuizManager._to_quiz_question(schema.model_validate(q), job.params["question_type"])
+        for q in job.questions[:job.params["num_questions"]]
+    ]
+    quiz_manager.user_answers = []
+    quiz_manager.results = []
+    quiz_manager.score = None
+    return bool(quiz_manager.summary or quiz_manager.flashcards or quiz_manager.questions)
+
+
+class JobQueue(ABC):
+    """Submission interface; a broker-backed queue would publish job ids for workers that call ``run_generation_job``."""
+
+    @abstractmethod
+    def submit(self, job_id: str) -> bool:
+        """Starts working on ``job_id``; returns False if it is already being worked on."""
+
+    @abstractmethod
+    def is_active(self, job_id: str) -> bool:
+        """Whether this queue is currently working on ``job_id``."""
+
+    def resume_if_stalled(self, job: GenerationJob, stale_seconds: float) -> bool:
+        """Resubmits an unfinished job nobody is working on, e.g. after the pod that ran it restarted."""
+        if job.finished or self.is_active(job.job_id) or time.time() - job.updated < stale_seconds:
+            return False
+        return self.submit(job.job_id)
+
+
+class LocalJobQueue(JobQueue):
+    """Thread pool worker; submitting a job that is already running here is a no-op."""
+
+    def __init__(self, runner: Callable[[str], None], max_workers: int):
+        self.runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation-job")
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._active:
+                return False
+            self._active.add(job_id)
+        self._executor.submit(self._run, job_id)
+        return True
+
+    def _run(self, job_id: str):
+        try:
+            self.runner(job_id)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._active
+
+
+_job_store = None
+_job_queue = None
+_jobs_lock = threading.Lock()
+
+
+def get_job_store():
+    """Process-wide job store selected by JOB_STORE: "sqlite" (this pod only) or "redis" (shared by all replicas)."""
+    global _job_store
+    with _jobs_lock:
+        if _job_store is None:
+            backend = settings.JOB_STORE
+            if backend == "sqlite":
+                _job_store = JobStore(settings.JOB_STORE_PATH, settings.JOB_RETENTION_SECONDS)
+            elif backend == "redis":
+                try:
+                    import redis
+                except ImportError as e:
+                    raise CustomException("JOB_STORE=redis requires the 'redis' package", e)
+                _job_store = RedisJobStore(redis.Redis.from_url(settings.JOB_REDIS_URL), settings.JOB_RETENTION_SECONDS)
+            else:
+                raise CustomException(f"Unknown JOB_STORE backend: {backend}")
+            get_logger(__name__).info("Using %s job store", backend)
+        return _job_store
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide worker pool shared by every session."""
+    global _job_queue
+    store = get_job_store()
+    with _jobs_lock:
+        if _job_queue is None:
+            _job_queue = LocalJobQueue(lambda job_id: run_generation_job(store, job_id), settings.JOB_WORKERS)
+        return _job_queue
@@ -1,96 +1,446 @@
-from src.models.question_schemas import MCQQuestion, FillBlankQuestion
+import time
+from typing import Iterator, List
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.utils.json import parse_json_markdown, parse_partial_json
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion, MCQQuestionBatch, FillBlankQuestionBatch
 from src.models.summary_schema import SummarySchema
-from src.models.flashcard_schema import FlashcardSet
-from src.llm.groq_client import get_groq_llm
+from src.models.flashcard_schema import Flashcard, FlashcardSet
+from src.llm.groq_client import get_groq_llm, get_json_llm, get_structured_llm
+from src.prompts.budget import normalize_source, render_prompt
 from src.prompts.templates import (
     mcq_prompt_template, 
     fill_blank_prompt_template,
+    mcq_batch_prompt_template,
+    fill_blank_batch_prompt_template,
     summarizer_prompt_template,
+    summary_reduce_prompt_template,
     flashcard_prompt_template
 )
 from src.config.setting import settings
 from src.common.logger import get_logger
 from src.common.custom_exception import CustomException
+from src.common.metrics import metrics, timed, traced
+from src.cache.response_cache import get_response_cache, make_cache_key
+from src.cache.single_flight import get_single_flight
+from src.utils.chunking import estimate_tokens, split_into_chunks
+from src.llm.rate_limiter import call_with_backoff, get_rate_limiter, is_transient_error
+from src.llm.router import get_model_router
 
 
 class QuestionGenerator:
     def __init__(self):
         self.llm = get_groq_llm()
         self.logger = get_logger(self.__class__.__name__)
+        self.cache = get_response_cache()
+        self.rate_limiter = get_rate_limiter()
+        self.single_flight = get_single_flight()
+        self.router = get_model_router()
 
-        # Structured LLMs
-        self.mcq_llm = self.llm.with_structured_output(MCQQuestion)
-        self.fill_blank_llm = self.llm.with_structured_output(FillBlankQuestion)
-        self.summary_llm = self.llm.with_structured_output(SummarySchema)
-        self.flashcard_llm = self.llm.with_structured_output(FlashcardSet)
+        # Structured LLMs, shared process-wide
+        self.mcq_llm = get_structured_llm(MCQQuestion)
+        self.fill_blank_llm = get_structured_llm(FillBlankQuestion)
+        self.summary_llm = get_structured_llm(SummarySchema)
+        self.flashcard_llm = get_structured_llm(FlashcardSet)
+        self.mcq_batch_llm = get_structured_llm(MCQQuestionBatch)
+        self.fill_blank_batch_llm = get_structured_llm(FillBlankQuestionBatch)
+        self.json_llm = get_json_llm()
 
-    def _retry_and_generate(self, structured_llm, prompt_template, topic, difficulty):
+    TASKS = {
+        MCQQuestion: "mcq", MCQQuestionBatch: "mcq",
+        FillBlankQuestion: "fill_blank", FillBlankQuestionBatch: "fill_blank",
+        SummarySchema: "summary", FlashcardSet: "flashcards",
+    }
+
+    @classmethod
+    def _task(cls, schema, difficulty=None) -> str:
+        """Routing task for a schema, e.g. ``mcq:easy``; questions are routed by difficulty."""
+        task = cls.TASKS[schema]
+        return f"{task}:{difficulty.lower()}" if difficulty else task
+
+    @staticmethod
+    def _is_valid_mcq(question: MCQQuestion) -> bool:
+        return bool(question) and len(question.options) == 4 and question.correct_answer in question.options
+
+    @staticmethod
+    def _is_valid_fill_blank(question: FillBlankQuestion) -> bool:
+        return bool(question and question.question and question.answer and "_____" in question.question)
+
+    def _cache_key(self, schema, prompt, variant=None, sampled=False, task=None):
+        if self.cache is None or settings.CACHE_BYPASS or (sampled and variant is None and settings.TEMPERATURE > 0):
+            return None
+        # Keyed by the task's primary model: a fallback answer is cached as if the primary gave it
+        model = self.router.route(task).primary if self.router and task else settings.MODEL_NAME
+        return make_cache_key(model, settings.TEMPERATURE, schema.__name__, prompt, variant)
+
+    @staticmethod
+    def _estimate_request_tokens(prompt) -> int:
+        return estimate_tokens(str(prompt)) + settings.RATE_LIMIT_COMPLETION_TOKENS
+
+    @staticmethod
+    def _record_usage(label, message):
+        usage = getattr(message, "usage_metadata", None) or {}
+        if usage:
+            metrics.inc("studyai_llm_tokens_total", usage.get("input_tokens", 0), help="LLM tokens by kind", schema=label, kind="prompt")
+            metrics.inc("studyai_llm_tokens_total", usage.get("output_tokens", 0), help="LLM tokens by kind", schema=label, kind="completion")
+
+    def _unwrap(self, label, result):
+        # Structured runnables return {"raw", "parsed", "parsing_error"}
+        if isinstance(result, dict) and "parsed" in result:
+            self._record_usage(label, result.get("raw"))
+            if result.get("parsing_error") is not None:
+                raise result["parsing_error"]
+            return result["parsed"]
+        return result
+
+    def _call_llm(self, fn, prompt, label="llm", max_retries=None, rate_limited=True):
+        """Single place where LLM requests are rate limited, retried with backoff and measured."""
+        with timed(f"llm:{label}"):
+            result = call_with_backoff(fn, prompt, limiter=self.rate_limiter if rate_limited else None,
+                                       tokens=self._estimate_request_tokens(prompt), max_retries=max_retries)
+        metrics.inc("studyai_llm_requests_total", help="LLM requests sent", schema=label)
+        return self._unwrap(label, result)
+
+    def _runnable(self, structured_llm, schema, model):
+        # The instance's runnables belong to the default model; other models use the shared per-model ones
+        return structured_llm if model == settings.MODEL_NAME else get_structured_llm(schema, model)
+
+    def _call_routed(self, structured_llm, schema, prompt, task):
+        """Calls through the model router when enabled.
+
+        The router is only handed the request itself. Rate-limit slots are taken in ``acquire`` before a
+        request is sent, and transient errors are retried around the whole route, so local waits are never
+        timed as model latency or hedged.
+        """
+        label = schema.__name__
+        if self.router is None:
+            return self._call_llm(structured_llm.invoke, prompt, label)
+        tokens = self._estimate_request_tokens(prompt)
+
+        def acquire(block):
+            if block:
+                self.rate_limiter.acquire(tokens)
+                return True
+            return self.rate_limiter.try_acquire(tokens)
+
+        def send(model, final):
+            return self._unwrap(label, self._runnable(structured_llm, schema, model).invoke(prompt))
+
+        return self._call_llm(lambda p: self.router.call(task, send, acquire), prompt, label, rate_limited=False)
+
+    @staticmethod
+    def _record_cache(result):
+        metrics.inc("studyai_cache_requests_total", help="Cache lookups by result", cache="response", result=result)
+
+    def _invoke(self, structured_llm, schema, prompt, variant=None, sampled=False, is_valid=None, difficulty=None):
+        """Invokes a structured LLM through the response cache.
+
+        Sampled calls ask the same prompt repeatedly for different questions, so with a non-zero
+        temperature they are only cached per ``variant`` slot. Results failing ``is_valid`` are not cached.
+        """
+        task = self._task(schema, difficulty)
+        key = self._cache_key(schema, prompt, variant, sampled, task)
+        if key is None:
+            return self._call_routed(structured_llm, schema, prompt, task)
+
+        cached = self.cache.get(key)
+        self._record_cache("hit" if cached is not None else "miss")
+        if cached is not None:
+            self.logger.info("Cache hit for %s", schema.__name__)
+            return schema.model_validate(cached)
+
+        # Identical requests already in flight (e.g. a whole class on the same topic) share one LLM call
+        return self.single_flight.do(key, self._fetch_and_cache, structured_llm, schema, prompt, key, is_valid, task)
+
+    def _fetch_and_cache(self, structured_llm, schema, prompt, key, is_valid=None, task=None):
+        result = self._call_routed(structured_llm, schema, prompt, task)
+        if result is not None and (is_valid is None or is_valid(result)):
+            self.cache.set(key, result.model_dump())
+        return result
+
+    def _stream(self, structured_llm, schema, prompt, build_partial) -> Iterator:
+        """Streams raw JSON tokens and yields ``build_partial(partial_dict)`` as fields arrive.
+
+        The last item yielded is always the complete, validated object. Cached responses are
+        yielded directly; unparseable streams fall back to a regular structured call.
+        """
+        task = self._task(schema)
+        key = self._cache_key(schema, prompt, task=task)
+        cached = self.cache.get(key) if key else None
+        if key:
+            self._record_cache("hit" if cached is not None else "miss")
+        if cached is not None:
+            self.logger.info("Cache hit for %s", schema.__name__)
+            yield schema.model_validate(cached)
+            return
+
+        if key is None:
+            yield from self._stream_llm(structured_llm, schema, prompt, build_partial, task)
+            return
+
+        # Followers of an identical in-flight stream only receive the final result
+        call, leader = self.single_flight.begin(key)
+        if not leader:
+            self.logger.info("Coalesced %s request onto an in-flight call", schema.__name__)
+            yield self.single_flight.wait(call)
+            return
+
+        result = None
+        try:
+            for result in self._stream_llm(structured_llm, schema, prompt, build_partial, task):
+                yield result
+            self.cache.set(key, result.model_dump())
+        except BaseException as e:
+            # Includes GeneratorExit from a consumer that stopped early: followers must never be left waiting
+            self.single_flight.finish(key, call, error=e)
+            raise
+        self.single_flight.finish(key, call, result)
+
+    def _stream_llm(self, structured_llm, schema, prompt, build_partial, task) -> Iterator:
+        text = ""
+        last = None
+        label = f"{schema.__name__}_stream"
+        # Streams are not hedged; they use the router's current choice and feed its stats
+        model = self.router.order(task)[0][0] if self.router else settings.MODEL_NAME
+        json_llm = self.json_llm if model == settings.MODEL_NAME else get_json_llm(model)
+        start = time.perf_counter()
+        try:
+            self.rate_limiter.acquire(self._estimate_request_tokens(prompt))
+            metrics.inc("studyai_llm_requests_total", help="LLM requests sent", schema=label)
+            for chunk in json_llm.stream(prompt):
+                self._record_usage(label, chunk)
+                text += chunk.content if isinstance(chunk.content, str) else ""
+                brace = text.find("{")
+                partial = parse_partial_json(text[brace:]) if brace >= 0 else None
+                if isinstance(partial, dict) and partial != last:
+                    last = partial
+                    yield build_partial(partial)
+            result = schema.model_validate(parse_json_markdown(text))
+            if self.router:
+                self.router.record(model, time.perf_counter() - start, True)
+        except Exception as e:
+            if self.router:
+                self.router.record(model, time.perf_counter() - start, False)
+            self.logger.warning("Streaming %s failed, falling back to a structured call: %s", schema.__name__, e)
+            result = self._call_routed(structured_llm, schema, prompt, task)
+            if result is None:
+                raise CustomException(f"LLM returned no {schema.__name__}")
+        yield result
+
+    def _retry_and_generate(self, structured_llm, schema, prompt_template, topic, difficulty, variant=None, is_valid=None):
+        # Transient API errors were already retried with backoff in _call_llm, only invalid output is retried here
+        last_error = None
         for attempt in range(settings.MAX_RETRIES):
             try:
-                self.logger.info(f"Generating question for topic: {topic}, difficulty: {difficulty}, attempt: {attempt + 1}")
+                self.logger.info("Generating question for topic: %s, difficulty: %s, attempt: %s", topic, difficulty, attempt + 1)
 
-                prompt = prompt_template.format(topic=topic, difficulty=difficulty)
-                question = structured_llm.invoke(prompt)
+                prompt = render_prompt(prompt_template, schema.__name__, topic=topic, difficulty=difficulty)
+                question = self._invoke(structured_llm, schema, prompt, variant=variant, sampled=True, is_valid=is_valid, difficulty=difficulty)
 
-                self.logger.info(f"Successfully generated question on attempt {attempt + 1}")
-                return question
+                if is_valid is None or is_valid(question):
+                    self.logger.info("Successfully generated question on attempt %s", attempt + 1)
+                    return question
+                metrics.inc("studyai_validation_failures_total", help="LLM outputs rejected by validation", schema=schema.__name__)
+                self.logger.warning("Invalid format on attempt %s, retrying...", attempt + 1)
 
             except Exception as e:
-                self.logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt == settings.MAX_RETRIES - 1:
-                    raise CustomException(f"Failed to generate question after {settings.MAX_RETRIES} attempts", e)
+                if is_transient_error(e):
+                    raise CustomException("LLM unavailable after retries with backoff", e)
+                self.logger.error("Attempt %s failed: %s", attempt + 1, e)
+                last_error = e
 
-    def generate_mcq(self, topic: str, difficulty: str = "medium") -> MCQQuestion:
+        raise CustomException(f"Failed to generate question after {settings.MAX_RETRIES} attempts", last_error)
+
+    @traced("mcq")
+    def generate_mcq(self, topic: str, difficulty: str = "medium", variant=None) -> MCQQuestion:
         try:
-            question = self._retry_and_generate(self.mcq_llm,mcq_prompt_template,topic,difficulty)
+            question = self._retry_and_generate(self.mcq_llm,MCQQuestion,mcq_prompt_template,topic,difficulty,variant,self._is_valid_mcq)
 
-            if len(question.options) != 4 or question.correct_answer not in question.options:
+            if not self._is_valid_mcq(question):
                 raise CustomException("Invalid MCQ format received from LLM")
 
             self.logger.info("Generated MCQ question successfully")
             return question
 
         except Exception as e:
-            self.logger.error(f"Error generating MCQ question: {str(e)}")
+            self.logger.error("Error generating MCQ question: %s", e)
             raise CustomException("Error generating MCQ question", e)
 
-    def generate_fill_blank(self, topic: str, difficulty: str = "medium") -> FillBlankQuestion:
+    @traced("fill_blank")
+    def generate_fill_blank(self, topic: str, difficulty: str = "medium", variant=None) -> FillBlankQuestion:
+        try:
+            question = self._retry_and_generate(self.fill_blank_llm,FillBlankQuestion,fill_blank_prompt_template,topic,difficulty,variant,self._is_valid_fill_blank)
+            self.logger.info("Generated Fill-in-the-Blank question successfully")
+            return question
+
+        except Exception as e:
+            self.logger.error("Error generating Fill-in-the-Blank question: %s", e)
+            raise CustomException("Error generating Fill-in-the-Blank question", e)
+
+    def _generate_batch(self, structured_llm, schema, prompt_template, is_valid, topic, difficulty, num_questions, variant=None):
+        # As in _retry_and_generate, only invalid or unparseable output is asked for again
+        questions = []
+        last_error = None
         for attempt in range(settings.MAX_RETRIES):
+            missing = num_questions - len(questions)
+            if missing <= 0:
+                break
             try:
-                self.logger.info(f"Generating fill-blank question, attempt: {attempt + 1}")
-                
-                prompt = fill_blank_prompt_template.format(topic=topic, difficulty=difficulty)
-                question = self.fill_blank_llm.invoke(prompt)
+                self.logger.info("Generating batch of %s questions, difficulty: %s, attempt: %s", missing, difficulty, attempt + 1)
+
+                prompt = render_prompt(prompt_template, schema.__name__, topic=topic, difficulty=difficulty, num_questions=missing)
+                batch = self._invoke(
+                    structured_llm, schema, prompt, variant=variant, sampled=True,
+                    is_valid=lambda b: len(b.questions) == missing and all(is_valid(q) for q in b.questions),
+                    difficulty=difficulty
+                )
+
+                valid = [q for q in batch.questions if is_valid(q)][:missing]
+                if len(valid) < missing:
+                    metrics.inc("studyai_validation_failures_total", missing - len(valid), help="LLM outputs rejected by validation", schema=schema.__name__)
+                    self.logger.warning("%s of %s batch items invalid or missing on attempt %s, regenerating them", missing - len(valid), missing, attempt + 1)
+                questions.extend(valid)
 
-                if question and question.question and question.answer and "_____" in question.question:
-                    self.logger.info("Generated Fill-in-the-Blank question successfully")
-                    return question
-                else:
-                    self.logger.warning(f"Invalid format on attempt {attempt + 1}, retrying...")
-                    
             except Exception as e:
-                self.logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                
-        raise CustomException("Error generating Fill-in-the-Blank question", None)
+                self.logger.error("Batch attempt %s failed: %s", attempt + 1, e)
+                last_error = e
+                # Parse and validation errors are ValueErrors; anything else (auth, exhausted retries) would repeat
+                if not isinstance(e, ValueError):
+                    break
+
+        if num_questions > 0 and not questions:
+            if last_error is not None and is_transient_error(last_error):
+                raise CustomException("LLM unavailable after retries with backoff", last_error)
+            raise CustomException(f"Failed to generate {schema.__name__} after {attempt + 1} attempts", last_error)
+        return questions
+
+    @traced("mcq_batch")
+    def generate_mcq_batch(self, topic: str, difficulty: str = "medium", num_questions: int = 5, variant=None) -> List[MCQQuestion]:
+        """Generates up to ``num_questions`` MCQs in one structured call, regenerating only invalid items."""
+        questions = self._generate_batch(self.mcq_batch_llm, MCQQuestionBatch, mcq_batch_prompt_template, self._is_valid_mcq, topic, difficulty, num_questions, variant)
+        self.logger.info("Generated %s/%s MCQ questions in batch mode", len(questions), num_questions)
+        return questions
+
+    @traced("fill_blank_batch")
+    def generate_fill_blank_batch(self, topic: str, difficulty: str = "medium", num_questions: int = 5, variant=None) -> List[FillBlankQuestion]:
+        """Generates up to ``num_questions`` fill-in-the-blank questions in one structured call, regenerating only invalid items."""
+        questions = self._generate_batch(self.fill_blank_batch_llm, FillBlankQuestionBatch, fill_blank_batch_prompt_template, self._is_valid_fill_blank, topic, difficulty, num_questions, variant)
+        self.logger.info("Generated %s/%s Fill-in-the-Blank questions in batch mode", len(questions), num_questions)
+        return questions
+
+    def _summarize(self, prompt) -> SummarySchema:
+        return self._invoke(self.summary_llm, SummarySchema, prompt)
+
+    @staticmethod
+    def _format_summaries(summaries: List[SummarySchema]) -> str:
+        return "\n\n".join(
+            f"Section {i + 1}: {s.main_idea}\n" + "\n".join(f"- {point}" for point in s.key_points)
+            for i, s in enumerate(summaries)
+        )
+
+    def _summary_chunks(self, topic: str) -> List[str]:
+        """Splits content for the map step into at most SUMMARY_MAX_CHUNKS chunks.
+
+        Long sources are first re-split into bigger chunks (up to what fits one prompt), and if that is
+        still too many, evenly spaced chunks are sampled so the map step's call count stays fixed.
+        """
+        text = normalize_source(topic)
+        chunks = split_into_chunks(text, settings.CHUNK_TOKENS, settings.CHUNK_OVERLAP_TOKENS)
+        max_chunks = max(1, settings.SUMMARY_MAX_CHUNKS)
+        if len(chunks) <= max_chunks:
+            return chunks
 
+        fits_prompt = settings.PROMPT_INPUT_TOKENS - estimate_tokens(summarizer_prompt_template.format(topic=""))
+        chunk_tokens = min(fits_prompt, -(-estimate_tokens(text) // max_chunks))
+        if chunk_tokens > settings.CHUNK_TOKENS:
+            chunks = split_into_chunks(text, chunk_tokens, settings.CHUNK_OVERLAP_TOKENS)
+        if len(chunks) > max_chunks:
+            self.logger.info("Summarizing %s of %s chunks", max_chunks, len(chunks))
+            chunks = [chunks[i * len(chunks) // max_chunks] for i in range(max_chunks)]
+        return chunks
+
+    def _reduce_prompt(self, summaries: List[SummarySchema]) -> str:
+        return render_prompt(summary_reduce_prompt_template, "SummarySchema", source_var="summaries",
+                             summaries=self._format_summaries(summaries))
+
+    def _summary_prompt(self, topic: str) -> str:
+        """Prompt for the final summary call; long content is first map-reduced to at most fan-out chunk summaries."""
+        chunks = self._summary_chunks(topic)
+        if len(chunks) <= 1:
+            return render_prompt(summarizer_prompt_template, "SummarySchema", topic=topic)
+
+        self.logger.info("Generating map-reduce summary over %s chunks...", len(chunks))
+        fan_out = max(2, settings.SUMMARY_MAX_FANOUT)
+        with ThreadPoolExecutor(max_workers=fan_out) as executor:
+            prompts = [render_prompt(summarizer_prompt_template, "SummarySchema", topic=chunk) for chunk in chunks]
+            summaries = list(executor.map(self._summarize, prompts))
+
+            # Reduce in rounds of at most fan_out summaries so every call's context stays bounded
+            while len(summaries) > fan_out:
+                groups = [summaries[i:i + fan_out] for i in range(0, len(summaries), fan_out)]
+                summaries = list(executor.map(self._summarize, map(self._reduce_prompt, groups)))
+        return self._reduce_prompt(summaries)
+
+    @traced("summary")
     def generate_summary(self, topic: str) -> SummarySchema:
         try:
-            self.logger.info(f"Generating summary for content...")
-            prompt = summarizer_prompt_template.format(topic=topic)
-            summary = self.summary_llm.invoke(prompt)
+            self.logger.info("Generating summary for content...")
+            summary = self._summarize(self._summary_prompt(topic))
             self.logger.info("Generated summary successfully")
             return summary
         except Exception as e:
-            self.logger.error(f"Error generating summary: {str(e)}")
+            self.logger.error("Error generating summary: %s", e)
             raise CustomException("Error generating summary", e)
 
+    @traced("summary_stream")
+    def stream_summary(self, topic: str) -> Iterator[SummarySchema]:
+        """Yields partial summaries as key points arrive; the last one is complete."""
+        try:
+            self.logger.info("Streaming summary for content...")
+            yield from self._stream(
+                self.summary_llm, SummarySchema, self._summary_prompt(topic),
+                lambda partial: SummarySchema(
+                    main_idea=str(partial.get("main_idea") or ""),
+                    key_points=[p for p in partial.get("key_points") or [] if isinstance(p, str)],
+                ),
+            )
+            self.logger.info("Streamed summary successfully")
+        except Exception as e:
+            self.logger.error("Error streaming summary: %s", e)
+            raise CustomException("Error generating summary", e)
+
+    @staticmethod
+    def _flashcard_prompt(topic: str, num_cards: int) -> str:
+        # Cards are drawn from the opening of the source, so it gets a smaller input budget
+        return render_prompt(flashcard_prompt_template, "FlashcardSet", max_input_tokens=settings.FLASHCARD_INPUT_TOKENS, topic=topic, num_cards=num_cards)
+
+    @traced("flashcards")
     def generate_flashcards(self, topic: str, num_cards: int = 5) -> FlashcardSet:
         try:
-            self.logger.info(f"Generating {num_cards} flashcards...")
-            prompt = flashcard_prompt_template.format(topic=topic, num_cards=num_cards)
-            flashcards = self.flashcard_llm.invoke(prompt)
+            self.logger.info("Generating %s flashcards...", num_cards)
+            prompt = self._flashcard_prompt(topic, num_cards)
+            flashcards = self._invoke(self.flashcard_llm, FlashcardSet, prompt)
             self.logger.info("Generated flashcards successfully")
             return flashcards
         except Exception as e:
-            self.logger.error(f"Error generating flashcards: {str(e)}")
+            self.logger.error("Error generating flashcards: %s", e)
+            raise CustomException("Error generating flashcards", e)
+
+
+    @traced("flashcards_stream")
+    def stream_flashcards(self, topic: str, num_cards: int = 5) -> Iterator[FlashcardSet]:
+        """Yields partial flashcard sets as cards arrive; the last one is complete."""
+        try:
+            self.logger.info("Streaming %s flashcards...", num_cards)
+            prompt = self._flashcard_prompt(topic, num_cards)
+            yield from self._stream(
+                self.flashcard_llm, FlashcardSet, prompt,
+                lambda partial: FlashcardSet(flashcards=[
+                    Flashcard(front=str(card["front"]), back=str(card.get("back") or ""))
+                    for card in partial.get("flashcards") or []
+                    if isinstance(card, dict) and card.get("front")
+                ]),
+            )
+            self.logger.info("Streamed flashcards successfully")
+        except Exception as e:
+            self.logger.error("Error streaming flashcards: %s", e)
             raise CustomException("Error generating flashcards", e)
@@ -0,0 +1,121 @@
+import queue
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional
+
+from src.generator.question_generator import QuestionGenerator
+from src.common.logger import get_logger
+from src.common.metrics import traced
+
+
+@dataclass
+class StageEvent:
+    stage: str
+    status: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+
+class StudyMaterialPipeline:
+    """Runs summary, flashcard and quiz generation concurrently and streams each stage's result."""
+
+    STAGES = ("summary", "flashcards", "quiz")
+
+    def __init__(self, generator: QuestionGenerator, quiz_manager, stream: bool = True):
+        self.generator = generator
+        self.quiz_manager = quiz_manager
+        self.stream = stream
+        self.logger = get_logger(self.__class__.__name__)
+        self.results = {}
+        self.errors = {}
+
+    @staticmethod
+    def _stream_stage(stage, items, events):
+        # Every item but the last is partial; the last one is the stage result
+        previous = None
+        for item in items:
+            if previous is not None:
+                events.put(StageEvent(stage, "partial", previous))
+            previous = item
+        return previous
+
+    def _summary(self, topic, events):
+        if not self.stream:
+            return self.generator.generate_summary(topic)
+        return self._stream_stage("summary", self.generator.stream_summary(topic), events)
+
+    def _flashcards(self, topic, num_cards, events):
+        if not self.stream:
+            return self.generator.generate_flashcards(topic, num_cards).flashcards
+        cards = (card_set.flashcards for card_set in self.generator.stream_flashcards(topic, num_cards))
+        return self._stream_stage("flashcards", cards, events)
+
+    def _quiz(self, topic, question_type, difficulty, num_questions, events, existing_questions=(), on_questions=None):
+        questions, errors = self.quiz_manager.collect_questions(
+            self.generator, topic, question_type, difficulty, num_questions,
+            progress_callback=lambda p: events.put(StageEvent("quiz", "progress", p)),
+            existing=existing_questions, on_questions=on_questions
+        )
+        if errors and not questions:
+            raise errors[0]
+        if errors:
+            self.logger.warning("%s of %s questions could not be generated, keeping %s", num_questions - len(questions), num_questions, len(questions))
+        return questions
+
+    def _run_stage(self, events, stage, fn, *args):
+        try:
+            events.put(StageEvent(stage, "done", fn(*args)))
+        except Exception as e:
+            self.logger.error("Stage '%s' failed: %s", stage, e)
+            events.put(StageEvent(stage, "error", error=e))
+
+    def _apply(self, event: StageEvent):
+        if event.status == "done":
+            self.results[event.stage] = event.value
+            if event.stage == "summary":
+                self.quiz_manager.summary = event.value
+            elif event.stage == "flashcards":
+                self.quiz_manager.flashcards = event.value
+            else:
+                self.quiz_manager.questions = event.value
+        elif event.status == "error":
+            self.errors[event.stage] = event.error
+
+    @traced("generate_materials")
+    def run(self, topic: str, question_type: str, difficulty: str, num_questions: int, num_cards: int,
+            summary_topic: Optional[str] = None, flashcard_topic: Optional[str] = None, skip=(),
+            existing_questions=(), on_questions=None) -> Iterator[StageEvent]:
+        """Yields progress, partial, result and error events as they happen; results are also applied to the quiz manager.
+
+        Stages in ``skip`` are not run, and ``existing_questions``/``on_questions`` are passed to ``collect_questions``,
+        which is how a resumed job avoids repeating finished work.
+        """
+        self.results = {}
+        self.errors = {}
+        self.quiz_manager.summary = None
+        self.quiz_manager.flashcards = []
+        self.quiz_manager.questions = []
+        self.quiz_manager.user_answers = []
+        self.quiz_manager.results = []
+        self.quiz_manager.score = None
+
+        events = queue.Queue()
+        stages = {
+            "summary": (self._summary, summary_topic or topic, events),
+            "flashcards": (self._flashcards, flashcard_topic or topic, num_cards, events),
+            "quiz": (self._quiz, topic, question_type, difficulty, num_questions, events, existing_questions, on_questions),
+        }
+        stages = {stage: args for stage, args in stages.items() if stage not in skip}
+        with ThreadPoolExecutor(max_workers=len(self.STAGES)) as executor:
+            for stage, (fn, *args) in stages.items():
+                executor.submit(self._run_stage, events, stage, fn, *args)
+
+            pending = len(stages)
+            while pending:
+                event = events.get()
+                self._apply(event)
+                if event.status in ("done", "error"):
+                    pending -= 1
+                yield event
+
+        self.logger.info("Pipeline finished: %s succeeded, %s failed", sorted(self.results), sorted(self.errors))
@@ -0,0 +1,110 @@
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion, MCQQuestionBatch, FillBlankQuestionBatch
+from src.models.summary_schema import SummarySchema
+from src.models.flashcard_schema import Flashcard, FlashcardSet
+
+_WORDS = (
+    "energy cell membrane protein enzyme light carbon water oxygen glucose nucleus gene "
+    "molecule reaction pressure volume force motion orbit planet climate ocean river mountain "
+    "empire treaty revolution economy market trade language grammar theorem equation vector "
+    "matrix circuit voltage signal network algorithm memory storage culture migration"
+).split()
+
+
+class FakeServiceError(Exception):
+    """Simulated transient API failure (treated like an HTTP 503)."""
+    status_code = 503
+
+
+class FakeChatModel:
+    """Offline stand-in for ChatGroq returning schema-valid output after simulated latency, jitter and failures."""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.failure_rate
+            words = self._rng.sample(_WORDS, 3)
+        time.sleep(delay)
+        if failed:
+            raise FakeServiceError("Simulated service unavailable")
+        return words
+
+    def _words(self):
+        with self._lock:
+            return self._rng.sample(_WORDS, 3)
+
+    @staticmethod
+    def _count(prompt: str, default: int = 5) -> int:
+        match = re.search(r"(?:Generate|Create) (\d+)", prompt)
+        return int(match.group(1)) if match else default
+
+    def _mcq(self, words=None):
+        a, b, c = words or self._words()
+        options = [a, b, c, "none of these"]
+        return MCQQuestion(question=f"Which {a} best explains {b} and {c}?", options=options, correct_answer=a, explanation=f"{a} drives {b}.")
+
+    def _fill_blank(self, words=None):
+        a, b, c = words or self._words()
+        return FillBlankQuestion(question=f"The {b} of {c} depends on _____.", answer=a, explanation=f"{a} controls {b}.")
+
+    def build(self, schema, prompt: str, words=None):
+        if schema is MCQQuestion:
+            return self._mcq(words)
+        if schema is FillBlankQuestion:
+            return self._fill_blank(words)
+        if schema is MCQQuestionBatch:
+            return MCQQuestionBatch(questions=[self._mcq() for _ in range(self._count(prompt))])
+        if schema is FillBlankQuestionBatch:
+            return FillBlankQuestionBatch(questions=[self._fill_blank() for _ in range(self._count(prompt))])
+        if schema is FlashcardSet:
+            return FlashcardSet(flashcards=[
+                Flashcard(front=f"What is {w}?", back=f"{w} is a key concept.") for w in (self._words()[0] for _ in range(self._count(prompt)))
+            ])
+        if schema is SummarySchema:
+            a, b, c = words or self._words()
+            return SummarySchema(main_idea=f"The text explains {a}.", key_points=[f"{a} relates to {b}", f"{c} matters"])
+        raise ValueError(f"FakeChatModel cannot build {schema.__name__}")
+
+    def with_structured_output(self, schema, include_raw: bool = False):
+        return _FakeStructuredRunnable(self, schema, include_raw)
+
+    def bind(self, **kwargs):
+        return self
+
+    def stream(self, prompt):
+        words = self._simulate()
+        schema = FlashcardSet if "flashcards" in str(prompt) else SummarySchema
+        text = json.dumps(self.build(schema, str(prompt), words).model_dump())
+        for i in range(0, len(text), 16):
+            yield SimpleNamespace(content=text[i:i + 16], usage_metadata=None)
+
+
+class _FakeStructuredRunnable:
+    def __init__(self, model: FakeChatModel, schema, include_raw: bool):
+        self.model = model
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def invoke(self, prompt):
+        words = self.model._simulate()
+        parsed = self.model.build(self.schema, str(prompt), words)
+        if not self.include_raw:
+            return parsed
+        prompt_tokens = len(str(prompt)) // 4
+        raw = SimpleNamespace(usage_metadata={"input_tokens": prompt_tokens, "output_tokens": len(parsed.model_dump_json()) // 4})
+        return {"raw": raw, "parsed": parsed, "parsing_error": None}
@@ -1,11 +1,84 @@
-from langchain_groq import ChatGroq
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
 from src.config.setting import settings
 
-def get_groq_llm():
-    chat_groq=ChatGroq(
-        groq_api_key=settings.GROQ_API_KEY,
-        model_name=settings.MODEL_NAME,
-        temperature=settings.TEMPERATURE,
-        max_retries=settings.MAX_RETRIES
-    )
-    return chat_groq
\ No newline at end of file
+_lock = threading.Lock()
+_llms = {}
+_structured_llms = {}
+_json_llms = {}
+_http_clients = None
+_override = None
+
+def _shared_http_clients():
+    # One pooled, keep-alive client pair serves every model; called with _lock held
+    global _http_clients
+    if _http_clients is None:
+        # langchain_groq and httpx load on first generation, keeping them off the app's cold start
+        import httpx
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(settings.REQUEST_TIMEOUT, connect=settings.CONNECT_TIMEOUT)
+        _http_clients = (httpx.Client(limits=limits, timeout=timeout), httpx.AsyncClient(limits=limits, timeout=timeout))
+    return _http_clients
+
+def get_groq_llm(model_name: Optional[str] = None):
+    """Process-wide ChatGroq per model, all sharing one pooled HTTP client across sessions and threads."""
+    model_name = model_name or settings.MODEL_NAME
+    with _lock:
+        if _override is not None:
+            return _override
+        if model_name not in _llms:
+            from langchain_groq import ChatGroq
+            http_client, http_async_client = _shared_http_clients()
+            _llms[model_name]=ChatGroq(
+                groq_api_key=settings.GROQ_API_KEY,
+                model_name=model_name,
+                temperature=settings.TEMPERATURE,
+                max_tokens=settings.PROMPT_OUTPUT_TOKENS,
+                # Retries and backoff are handled once, in rate_limiter.call_with_backoff
+                max_retries=0,
+                request_timeout=settings.REQUEST_TIMEOUT,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+        return _llms[model_name]
+
+def get_structured_llm(schema, model_name: Optional[str] = None):
+    """Prebuilt ``with_structured_output`` runnable for ``schema``, shared by every QuestionGenerator.
+
+    Built with ``include_raw=True`` so callers can read token usage off the raw message.
+    """
+    model_name = model_name or settings.MODEL_NAME
+    llm = get_groq_llm(model_name)
+    with _lock:
+        if (schema, model_name) not in _structured_llms:
+            _structured_llms[(schema, model_name)] = llm.with_structured_output(schema, include_raw=True)
+        return _structured_llms[(schema, model_name)]
+
+
+def get_json_llm(model_name: Optional[str] = None):
+    """Shared JSON-mode runnable, used when partial structured output is streamed token by token."""
+    model_name = model_name or settings.MODEL_NAME
+    llm = get_groq_llm(model_name)
+    with _lock:
+        if model_name not in _json_llms:
+            _json_llms[model_name] = llm.bind(response_format={"type": "json_object"})
+        return _json_llms[model_name]
+
+@contextmanager
+def override_llm(llm):
+    """Temporarily serves ``llm`` for every model (e.g. ``FakeChatModel`` for offline benchmarks)."""
+    global _override, _json_llms, _structured_llms
+    with _lock:
+        saved = (_override, _json_llms, _structured_llms)
+        _override, _json_llms, _structured_llms = llm, {}, {}
+    try:
+        yield llm
+    finally:
+        with _lock:
+            _override, _json_llms, _structured_llms = saved
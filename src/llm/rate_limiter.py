@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import httpx
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+
+try:
+    import groq
+    _CONNECTION_ERRORS = (httpx.TransportError, groq.APIConnectionError)
+except ImportError:
+    _CONNECTION_ERRORS = (httpx.TransportError,)
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Token bucket using reservations: callers deduct up front and sleep for the returned deficit outside the lock."""
+
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def available(self, amount: float) -> bool:
+        self._refill()
+        return self.tokens >= min(amount, self.capacity)
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.refill_per_second)
+
+
+class RateLimiter:
+    """Client-side limiter tracking both requests/min and tokens/min; a limit of 0 disables that bucket."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60, clock) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60, clock) if tokens_per_minute > 0 else None
+        self.sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Blocks until one request and ``tokens`` tokens fit the budget; returns the time waited."""
+        with self._lock:
+            wait = max(
+                self.requests.reserve(1) if self.requests else 0.0,
+                self.tokens.reserve(tokens) if self.tokens else 0.0,
+            )
+        if wait > 0:
+            metrics.observe("studyai_rate_limit_wait_seconds", wait, help="Time spent waiting on the client-side rate limiter")
+            logger.info("Rate limiter delaying request by %.2fs", wait)
+            self.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """Reserves one request and ``tokens`` tokens only if both fit the budget right now; never waits."""
+        buckets = [(bucket, amount) for bucket, amount in ((self.requests, 1), (self.tokens, tokens)) if bucket]
+        with self._lock:
+            if not all(bucket.available(amount) for bucket, amount in buckets):
+                return False
+            for bucket, amount in buckets:
+                bucket.reserve(amount)
+        return True
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)
+    return status
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Rate limits, server errors and connection problems; other errors will not go away on retry."""
+    status = get_status_code(error)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return isinstance(error, _CONNECTION_ERRORS)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 1.0, cap: float = 30.0,
+                  rng: Callable[[float, float], float] = random.uniform) -> float:
+    """Full-jitter exponential backoff; a server-provided retry-after is honored as the minimum wait."""
+    delay = rng(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = min(cap, retry_after) + rng(0, base)
+    return delay
+
+
+def call_with_backoff(fn: Callable, *args, limiter: Optional[RateLimiter] = None, tokens: int = 0,
+                      max_retries: Optional[int] = None, sleep: Callable[[float], None] = time.sleep):
+    """Calls ``fn`` through the limiter, retrying only transient errors with jittered exponential backoff."""
+    max_retries = settings.MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries):
+        if limiter is not None:
+            limiter.acquire(tokens)
+        try:
+            return fn(*args)
+        except Exception as e:
+            if not is_transient_error(e) or attempt == max_retries - 1:
+                raise
+            metrics.inc("studyai_llm_retries_total", help="Transient LLM errors retried", status=get_status_code(e) or type(e).__name__)
+            delay = backoff_delay(attempt, get_retry_after(e), settings.BACKOFF_BASE_SECONDS, settings.BACKOFF_MAX_SECONDS)
+            logger.warning("Transient LLM error (attempt %s/%s), retrying in %.2fs: %s", attempt + 1, max_retries, delay, e)
+            sleep(delay)
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every QuestionGenerator."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM)
+        return _rate_limiter
@@ -0,0 +1,217 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+
+
+@dataclass(frozen=True)
+class Route:
+    primary: str
+    fallback: Optional[str] = None
+
+
+def default_routes() -> Dict[str, Route]:
+    """Task -> models; MODEL_ROUTES (JSON, e.g. ``{"flashcards": ["model-a", "model-b"]}``) overrides entries."""
+    large, fast = settings.MODEL_NAME, settings.FAST_MODEL_NAME
+    routes = {
+        "summary": Route(large, fast),
+        "flashcards": Route(fast, large),
+        "mcq:easy": Route(fast, large),
+        "mcq:medium": Route(large, fast),
+        "mcq:hard": Route(large, fast),
+        "fill_blank:easy": Route(fast, large),
+        "fill_blank:medium": Route(large, fast),
+        "fill_blank:hard": Route(large, fast),
+    }
+    for task, models in json.loads(settings.MODEL_ROUTES or "{}").items():
+        routes[task] = Route(*models)
+    return routes
+
+
+class ModelStats:
+    """Rolling window of (latency, success) samples for one model."""
+
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self._samples.append((latency, ok))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = list(self._samples)
+        latencies = sorted(latency for latency, ok in samples if ok)
+        return {
+            "requests": len(samples),
+            "error_rate": round(sum(not ok for _, ok in samples) / len(samples), 3) if samples else 0.0,
+            "p50_seconds": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "p95_seconds": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 3) if latencies else None,
+        }
+
+
+class ModelRouter:
+    """Picks a model per task from rolling health stats, hedges slow calls and fails over on errors.
+
+    ``call(task, fn, acquire)`` invokes ``fn(model, final)``, which should only send the request: local
+    waits such as rate limiting belong in ``acquire`` so they are neither timed nor hedged. ``final`` is
+    False while another model could still take over. Recent decisions are kept for inspection.
+    """
+
+    def __init__(self, routes: Dict[str, Route], hedge_after: float, window: int = 50, max_error_rate: float = 0.5,
+                 min_samples: int = 5, max_workers: int = 16, clock: Callable[[], float] = time.perf_counter):
+        self.routes = routes
+        self.hedge_after = hedge_after
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.clock = clock
+        self._stats: Dict[str, ModelStats] = {}
+        self._decisions = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-route")
+        self.logger = get_logger(self.__class__.__name__)
+
+    def route(self, task: str) -> Route:
+        return self.routes.get(task) or Route(settings.MODEL_NAME, settings.FAST_MODEL_NAME)
+
+    def stats(self, model: str) -> ModelStats:
+        with self._lock:
+            if model not in self._stats:
+                self._stats[model] = ModelStats(self.window)
+            return self._stats[model]
+
+    def record(self, model: str, latency: float, ok: bool):
+        self.stats(model).record(latency, ok)
+
+    def _unhealthy(self, model: str) -> bool:
+        snapshot = self.stats(model).snapshot()
+        if snapshot["requests"] < self.min_samples:
+            return False
+        slow = self.hedge_after > 0 and (snapshot["p50_seconds"] or 0) > self.hedge_after
+        return snapshot["error_rate"] >= self.max_error_rate or slow
+
+    def order(self, task: str) -> Tuple[List[str], str]:
+        """Models to try for ``task`` in order, and why; an unhealthy primary is demoted behind its fallback."""
+        route = self.route(task)
+        if route.fallback and self._unhealthy(route.primary) and not self._unhealthy(route.fallback):
+            return [route.fallback, route.primary], "demoted"
+        return [m for m in (route.primary, route.fallback) if m], "primary"
+
+    def _timed(self, fn, model, final, sent):
+        # Timed from inside the worker, so executor queueing is not counted as model latency
+        start = sent[model] = self.clock()
+        try:
+            result = fn(model, final)
+        except Exception:
+            self.record(model, self.clock() - start, False)
+            raise
+        self.record(model, self.clock() - start, True)
+        return result
+
+    def _decide(self, task, model, reason, candidates, start):
+        decision = {
+            "time": time.time(), "task": task, "model": model, "reason": reason,
+            "candidates": candidates, "latency_seconds": round(self.clock() - start, 3),
+        }
+        self._decisions.append(decision)
+        metrics.inc("studyai_llm_routes_total", help="Routed LLM calls by chosen model and reason", task=task, model=model, reason=reason)
+        if reason != "primary":
+            self.logger.info("Routed %s to %s (%s)", task, model, reason)
+
+    def call(self, task: str, fn: Callable[[str, bool], Any], acquire: Optional[Callable[[bool], bool]] = None):
+        """Calls ``fn`` on the task's models, hedging a model still unanswered ``hedge_after`` seconds after it was sent.
+
+        ``acquire(block)`` runs in the calling thread before each request: blocking for the first model and on
+        failover, non-blocking for a hedge, which is skipped when it returns False (no slot free right away).
+        """
+        candidates, reason = self.order(task)
+        start = self.clock()
+        pending = {}
+        sent = {}
+        errors = []
+        next_index = 0
+        hedging = self.hedge_after > 0
+
+        def launch():
+            nonlocal next_index
+            model = candidates[next_index]
+            next_index += 1
+            pending[self._executor.submit(self._timed, fn, model, next_index == len(candidates), sent)] = model
+
+        if acquire is not None:
+            acquire(True)
+        launch()
+        while pending:
+            timeout = None
+            if hedging and next_index < len(candidates):
+                sent_at = sent.get(candidates[next_index - 1])
+                timeout = self.hedge_after if sent_at is None else max(0.0, sent_at + self.hedge_after - self.clock())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                sent_at = sent.get(candidates[next_index - 1])
+                if sent_at is None or self.clock() - sent_at < self.hedge_after:
+                    # Still queued locally: the deadline only starts once the request is sent
+                    continue
+                if acquire is not None and not acquire(False):
+                    # No free slot, so a hedge would only queue behind the primary and double the load
+                    hedging = False
+                    continue
+                # Primary is past the deadline: race a second model and take whichever answers first
+                reason = "hedged"
+                launch()
+                continue
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    if not pending and next_index < len(candidates):
+                        reason = "failover"
+                        if acquire is not None:
+                            acquire(True)
+                        launch()
+                    continue
+                self._decide(task, model, reason, candidates, start)
+                return result
+
+        self._decide(task, None, "failed", candidates, start)
+        raise errors[-1]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            models = list(self._stats)
+        return {
+            "routes": {task: [route.primary, route.fallback] for task, route in self.routes.items()},
+            "models": {model: self.stats(model).snapshot() for model in models},
+            "decisions": list(self._decisions),
+        }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> Optional[ModelRouter]:
+    """Process-wide router shared by every QuestionGenerator, or None when routing is disabled."""
+    global _router
+    if not settings.MODEL_ROUTING_ENABLED:
+        return None
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter(
+                default_routes(),
+                hedge_after=settings.HEDGE_AFTER_SECONDS,
+                window=settings.ROUTER_WINDOW,
+                max_error_rate=settings.ROUTER_MAX_ERROR_RATE,
+            )
+        return _router
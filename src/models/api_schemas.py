@@ -0,0 +1,27 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from src.config.setting import settings
+
+class SummaryRequest(BaseModel):
+    content: str = Field(min_length=1, max_length=settings.PDF_MAX_CHARS, description="Topic or source text to summarize")
+
+class FlashcardRequest(BaseModel):
+    content: str = Field(min_length=1, max_length=settings.PDF_MAX_CHARS, description="Topic or source text to build flashcards from")
+    num_cards: int = Field(default=5, ge=1, le=15, description="Number of flashcards to generate")
+
+class QuizRequest(BaseModel):
+    content: str = Field(min_length=1, max_length=settings.PDF_MAX_CHARS, description="Topic or source text to build the quiz from")
+    question_type: Literal["Multiple Choice", "Fill in the Blank"] = Field(default="Multiple Choice")
+    difficulty: Literal["Easy", "Medium", "Hard"] = Field(default="Medium")
+    num_questions: int = Field(default=5, ge=1, le=20, description="Number of questions to generate")
+
+class QuizQuestionResponse(BaseModel):
+    type: Literal["MCQ", "Fill in the Blank"]
+    question: str
+    options: Optional[List[str]] = None
+    correct_answer: str
+    explanation: str
+
+class QuizResponse(BaseModel):
+    questions: List[QuizQuestionResponse] = Field(description="Generated questions in request order")
+    errors: List[str] = Field(default_factory=list, description="Failures for questions that could not be generated")
@@ -11,4 +11,11 @@ class MCQQuestion(BaseModel):
 class FillBlankQuestion(BaseModel):
     question: str = Field(description="The Question text with '_____' for the blank")
     answer: str = Field(description="The correct answer to fill in the blank")
-    explanation: str = Field(description="Detailed explanation of why the answer is correct")
\ No newline at end of file
+    explanation: str = Field(description="Detailed explanation of why the answer is correct")
+
+class MCQQuestionBatch(BaseModel):
+    questions: List[MCQQuestion] = Field(description="List of distinct multiple-choice questions")
+
+
+class FillBlankQuestionBatch(BaseModel):
+    questions: List[FillBlankQuestion] = Field(description="List of distinct fill-in-the-blank questions")
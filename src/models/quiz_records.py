@@ -0,0 +1,40 @@
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+# Plain slotted records rather than pydantic models: these live in every session's state and are
+# read on each rerun, so they skip validation and per-instance __dict__s.
+
+@dataclass(frozen=True, slots=True)
+class QuizQuestion:
+    type: str
+    question: str
+    correct_answer: str
+    explanation: str
+    options: Tuple[str, ...] = ()
+
+    @property
+    def is_mcq(self) -> bool:
+        return self.type == "MCQ"
+
+    def to_dict(self) -> dict:
+        data = {"type": self.type, "question": self.question, "correct_answer": self.correct_answer, "explanation": self.explanation}
+        if self.is_mcq:
+            data["options"] = list(self.options)
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class QuizResult:
+    question_number: int
+    question: str
+    question_type: str
+    user_answer: Optional[str]
+    correct_answer: str
+    is_correct: bool
+    options: Tuple[str, ...]
+    explanation: str
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["options"] = list(self.options)
+        return data
@@ -0,0 +1,59 @@
+import re
+from collections import Counter
+from typing import Optional
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+from src.utils.chunking import estimate_tokens, split_into_chunks
+
+logger = get_logger(__name__)
+
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d+(?:\s*(?:of|/)\s*\d+)?$", re.IGNORECASE)
+_HYPHEN_BREAK = re.compile(r"(\w)-\n(\w)")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def normalize_source(text: str, repeat_threshold: int = 3) -> str:
+    """Collapses whitespace and drops PDF boilerplate: page numbers and short lines repeated on many pages.
+
+    Paragraph breaks are kept so chunking can still split on them.
+    """
+    text = _HYPHEN_BREAK.sub(r"\1\2", text)
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    # Running headers/footers repeat verbatim on every page
+    counts = Counter(line for line in lines if line and len(line) <= 80)
+    kept = [
+        line for line in lines
+        if not line or not (_PAGE_NUMBER.match(line) or counts[line] >= repeat_threshold)
+    ]
+    paragraphs = (" ".join(p.split()) for p in _PARAGRAPH_BREAK.split("\n".join(kept)))
+    return "\n\n".join(p for p in paragraphs if p)
+
+
+def fit_to_tokens(text: str, max_tokens: int) -> str:
+    """Keeps as many leading whole sentences of ``text`` as fit in ``max_tokens``."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    chunks = split_into_chunks(text, max(1, max_tokens))
+    return chunks[0] if chunks else ""
+
+
+def render_prompt(template, label: str, source_var: str = "topic", max_input_tokens: Optional[int] = None, **values) -> str:
+    """Formats ``template`` with its source text normalized and cut to the input token budget.
+
+    Records the tokens sent and the tokens compaction saved, per schema ``label``.
+    """
+    budget = max_input_tokens or settings.PROMPT_INPUT_TOKENS
+    raw_source = str(values[source_var])
+    overhead = estimate_tokens(template.format(**{**values, source_var: ""}))
+    source = fit_to_tokens(normalize_source(raw_source), budget - overhead)
+    prompt = template.format(**{**values, source_var: source})
+
+    tokens = estimate_tokens(prompt)
+    saved = estimate_tokens(raw_source) - estimate_tokens(source)
+    metrics.inc("studyai_prompt_tokens_total", tokens, help="Estimated prompt tokens by kind", schema=label, kind="sent")
+    metrics.inc("studyai_prompt_tokens_total", saved, help="Estimated prompt tokens by kind", schema=label, kind="saved")
+    if saved:
+        logger.debug("%s prompt: %s tokens, %s saved by compaction (budget %s)", label, tokens, saved, budget)
+    return prompt
@@ -0,0 +1,57 @@
+import math
+import re
+from typing import List
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_WORD = re.compile(r"\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, offline token estimate (~4 chars per token, at least one per word), close enough for budgeting."""
+    return sum(max(1, math.ceil(len(word) / 4)) for word in _WORD.findall(text))
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[str]:
+    pieces, current, current_tokens = [], [], 0
+    for word in _WORD.findall(sentence):
+        tokens = estimate_tokens(word)
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def split_into_chunks(text: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """Packs whole sentences into chunks of at most ``chunk_tokens``, repeating up to ``overlap_tokens`` between chunks."""
+    sentences = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+        if estimate_tokens(sentence) > chunk_tokens:
+            sentences.extend(_split_long_sentence(sentence, chunk_tokens))
+        else:
+            sentences.append(sentence)
+
+    chunks, current, current_tokens = [], [], 0
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(" ".join(current))
+            overlap, overlap_size = [], 0
+            for previous in reversed(current):
+                size = estimate_tokens(previous)
+                if overlap_size + size > overlap_tokens or overlap_size + size + tokens > chunk_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += size
+            current, current_tokens = overlap, overlap_size
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
@@ -0,0 +1,131 @@
+import hashlib
+import importlib.util
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+from src.config.setting import settings
+from src.common.logger import get_logger
+from src.cache.response_cache import LRUCache
+from src.common.metrics import metrics, traced
+
+logger = get_logger(__name__)
+
+# Process-wide, so Streamlit reruns and other sessions uploading the same file skip PyPDF2
+_text_cache = LRUCache(max_entries=settings.PDF_TEXT_CACHE_ENTRIES)
+
+
+def _pdf_reader(data: bytes):
+    # Imported on first upload so rendering the app never pays for PyPDF2
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _read_bytes(file) -> bytes:
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "read"):
+        file.seek(0)
+        return file.read()
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    reader = _pdf_reader(data)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _iter_reader_pages(reader, max_pages: int) -> Iterator[str]:
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            logger.warning("PDF has more than %s pages, ignoring the rest", max_pages)
+            break
+        yield page.extract_text() or ""
+
+
+def iter_pdf_pages(file, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Lazily yields the text of each page, stopping after ``max_pages``."""
+    reader = _pdf_reader(_read_bytes(file))
+    return _iter_reader_pages(reader, max_pages or settings.PDF_MAX_PAGES)
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Long-lived worker pool, started with "spawn": forking the threaded Streamlit server can copy held locks."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.PDF_PROCESS_WORKERS), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _iter_pages_parallel(data: bytes, num_pages: int) -> Iterator[str]:
+    workers = max(1, settings.PDF_PROCESS_WORKERS)
+    step = -(-num_pages // workers)
+    ranges = [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+    futures = [_get_process_pool().submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+    for future in futures:
+        yield from future.result()
+
+
+def _extract_text(data: bytes, max_chars: int, max_pages: int) -> str:
+    reader = _pdf_reader(data)
+    num_pages = min(len(reader.pages), max_pages)
+    # Parallel extraction only pays off when most pages are going to be read anyway
+    if num_pages >= settings.PDF_PARALLEL_MIN_PAGES and max_chars >= settings.PDF_MAX_CHARS:
+        if len(reader.pages) > max_pages:
+            logger.warning("PDF has more than %s pages, ignoring the rest", max_pages)
+        pages = _iter_pages_parallel(data, num_pages)
+    else:
+        pages = _iter_reader_pages(reader, max_pages)
+
+    parts = []
+    length = 0
+    for page_text in pages:
+        parts.append(page_text)
+        length += len(page_text) + 1
+        if length >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+
+@traced("pdf_extract")
+def extract_text_from_pdf(file, max_chars: Optional[int] = None, max_pages: Optional[int] = None):
+    """Extracts up to ``max_chars`` characters, memoized by a digest of the uploaded bytes."""
+    if importlib.util.find_spec("PyPDF2") is None:
+        return "Error: PyPDF2 library not found. Please install it using 'pip install PyPDF2'."
+    
+    try:
+        data = _read_bytes(file)
+        if len(data) > settings.PDF_MAX_FILE_BYTES:
+            return f"Error: PDF is larger than the {settings.PDF_MAX_FILE_BYTES // (1024 * 1024)} MB upload limit."
+
+        max_chars = min(max_chars or settings.PDF_MAX_CHARS, settings.PDF_MAX_CHARS)
+        max_pages = min(max_pages or settings.PDF_MAX_PAGES, settings.PDF_MAX_PAGES)
+
+        key = (hashlib.sha256(data).hexdigest(), max_chars, max_pages)
+        text = _text_cache.get(key)
+        metrics.inc("studyai_cache_requests_total", help="Cache lookups by result", cache="pdf_text", result="hit" if text is not None else "miss")
+        if text is not None:
+            stats = _text_cache.stats()
+            logger.info("PDF text cache hit (%s hits / %s misses)", stats['hits'], stats['misses'])
+            return text
+
+        start = time.perf_counter()
+        text = _extract_text(data, max_chars, max_pages)
+        _text_cache.set(key, text)
+        logger.info("Extracted %s chars from %s byte PDF in %.3fs", len(text), len(data), time.perf_counter() - start)
+        return text
+    except Exception as e:
+        return f"Error extracting text from PDF: {str(e)}"
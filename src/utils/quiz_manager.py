@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+from src.config.setting import settings
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.common.metrics import metrics, traced
+from src.utils.retrieval import build_question_contexts
+from src.cache.question_bank import QuestionBank, get_prefiller, get_question_bank, question_fingerprint
+from src.utils.similarity import NearDuplicateFilter
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion
+from src.models.quiz_records import QuizQuestion, QuizResult
+from src.models.summary_schema import SummarySchema
+from src.models.flashcard_schema import Flashcard
+
+if TYPE_CHECKING:
+    from src.generator.question_generator import QuestionGenerator
+
+
+# No module-level UI imports: the API, job workers and batch CLI use QuizManager headless,
+# and only the methods that render or report through Streamlit import it.
+
+class QuizManager:
+    def __init__(self):
+        self.questions=[]
+        self.user_answers=[]
+        self.results=[]
+        self.score=None
+        self.summary = None
+        self.flashcards = []
+        self.logger = get_logger(self.__class__.__name__)
+        
+    def to_state(self) -> dict:
+        """JSON-ready snapshot for the session store."""
+        return {
+            'questions':[q.to_dict() for q in self.questions],
+            'user_answers':self.user_answers,
+            'results':[r.to_dict() for r in self.results],
+            'score':self.score,
+            'summary':self.summary.model_dump() if self.summary else None,
+            'flashcards':[card.model_dump() for card in self.flashcards],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict):
+        manager=cls()
+        manager.questions=[QuizQuestion(**{**q, 'options':tuple(q.get('options', ()))}) for q in state['questions']]
+        manager.user_answers=state['user_answers']
+        manager.results=[QuizResult(**{**r, 'options':tuple(r['options'])}) for r in state['results']]
+        manager.score=tuple(state['score']) if state['score'] else None
+        manager.summary=SummarySchema.model_validate(state['summary']) if state['summary'] else None
+        manager.flashcards=[Flashcard.model_validate(card) for card in state['flashcards']]
+        return manager
+
+    @staticmethod
+    def _to_quiz_question(question, question_type:str):
+        if question_type=="Multiple Choice":
+            return QuizQuestion(
+                type='MCQ',
+                question=question.question,
+                options=tuple(question.options),
+                correct_answer=question.correct_answer,
+                explanation=question.explanation
+            )
+        
+        return QuizQuestion(
+            type='Fill in the Blank',
+            question=question.question,
+            correct_answer=question.answer,
+            explanation=question.explanation
+        )
+
+    def _generate_question_batch(self,generator:QuestionGenerator,topic:str,question_type:str,difficulty:str,count:int,variant=None):
+        if count==1:
+            if question_type=="Multiple Choice":
+                return [generator.generate_mcq(topic, difficulty.lower(), variant=variant)]
+            return [generator.generate_fill_blank(topic, difficulty.lower(), variant=variant)]
+        
+        if question_type=="Multiple Choice":
+            return generator.generate_mcq_batch(topic, difficulty.lower(), count, variant=variant)
+        return generator.generate_fill_blank_batch(topic, difficulty.lower(), count, variant=variant)
+
+    def _generate_models(self,generator:QuestionGenerator,topic:str,question_type:str,difficulty:str,num_questions:int, progress_callback=None, max_workers=None, batch_size=None, variant_offset=0, batch_callback=None):
+        """Generates questions concurrently in batches; returns them in request order along with per-item errors.
+        
+        ``batch_callback`` receives each batch's questions on the calling thread as soon as that batch finishes.
+        Long sources are indexed so each batch is grounded on its own distinct, relevant slices of the text.
+        """
+        if num_questions<=0:
+            return [], []
+        
+        batch_size=max(1, batch_size or settings.QUESTION_BATCH_SIZE)
+        starts=list(range(0, num_questions, batch_size))
+        sizes=[min(batch_size, num_questions - start) for start in starts]
+        contexts=build_question_contexts(topic, num_questions, settings.RETRIEVAL_CHUNK_TOKENS)
+        batch_topics=["\n\n".join(dict.fromkeys(contexts[start:start + size])) for start, size in zip(starts, sizes)]
+        max_workers=max(1, min(max_workers or settings.QUESTION_CONCURRENCY, len(sizes)))
+        slots=[[] for _ in sizes]
+        errors=[]
+        completed=0
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures={
+                executor.submit(self._generate_question_batch, generator, batch_topics[i], question_type, difficulty, size, variant_offset + i): i
+                for i, size in enumerate(sizes)
+            }
+            for future in as_completed(futures):
+                i=futures[future]
+                try:
+                    slots[i]=future.result()
+                    if len(slots[i]) < sizes[i]:
+                        errors.append(CustomException(f"Only {len(slots[i])} of {sizes[i]} questions in batch passed validation"))
+                except Exception as e:
+                    errors.append(e)
+                if batch_callback and slots[i]:
+                    batch_callback(slots[i])
+                
+                completed+=sizes[i]
+                if progress_callback:
+                    progress_callback(completed / num_questions)
+        
+        return [q for batch in slots for q in batch], errors
+
+    @traced("quiz")
+    def collect_questions(self,generator:QuestionGenerator,topic:str,question_type:str,difficulty:str,num_questions:int, progress_callback=None, max_workers=None, batch_size=None, existing=(), on_questions=None):
+        """Samples banked questions for this source first and only calls the LLM for the shortfall.
+        
+        Near-duplicate questions are rejected as each batch arrives and replaced in further rounds.
+        ``existing`` questions (e.g. from an interrupted job) count towards the total, and ``on_questions``
+        is called with every newly accepted group of questions so callers can persist them as they land.
+        """
+        bank=get_question_bank()
+        bank_key=QuestionBank.make_key(topic, question_type, difficulty)
+        schema=MCQQuestion if question_type=="Multiple Choice" else FillBlankQuestion
+        dedup=NearDuplicateFilter(settings.DEDUP_SIMILARITY_THRESHOLD)
+        
+        questions=[q for q in existing if dedup.add(q.question)]
+        requests=bank.record_request(bank_key) if bank else 0
+        banked=bank.sample(
+            bank_key, schema, num_questions - len(questions), exclude=[question_fingerprint(q.question) for q in questions]
+        ) if bank and len(questions) < num_questions else []
+        accepted_banked=[q for q in banked if dedup.add(q.question)]
+        if on_questions and accepted_banked:
+            on_questions(accepted_banked)
+        questions.extend(accepted_banked)
+        initial=len(questions)
+        if questions and progress_callback:
+            progress_callback(initial / num_questions)
+        
+        errors=[]
+        variant_offset=0
+        for round_number in range(settings.MAX_RETRIES):
+            shortfall=num_questions-len(questions)
+            if shortfall<=0:
+                break
+            
+            round_progress=None
+            if round_number==0 and progress_callback:
+                round_progress=lambda p: progress_callback((initial + p * shortfall) / num_questions)
+            
+            accepted=set()
+            def accept(batch):
+                unique=[q for q in batch if dedup.add(q.question)]
+                accepted.update(map(id, unique))
+                if on_questions and unique:
+                    on_questions(unique)
+            
+            round_questions, round_errors=self._generate_models(
+                generator, topic, question_type, difficulty, shortfall,
+                progress_callback=round_progress, max_workers=max_workers,
+                batch_size=batch_size, variant_offset=variant_offset, batch_callback=accept
+            )
+            variant_offset+=shortfall
+            errors.extend(round_errors)
+            
+            unique=[q for q in round_questions if id(q) in accepted]
+            questions.extend(unique)
+            if len(unique)==len(round_questions):
+                break
+            metrics.inc("studyai_duplicate_questions_total", len(round_questions) - len(unique), help="Near-duplicate questions rejected")
+            self.logger.info("Rejected %s near-duplicate questions, requesting replacements", len(round_questions) - len(unique))
+        
+        if bank:
+            bank.add(bank_key, questions[initial:])
+            prefiller=get_prefiller()
+            # Only sources people keep coming back to are worth spending background LLM calls on
+            if prefiller and requests >= settings.QUESTION_BANK_PREFILL_MIN_REQUESTS:
+                prefiller.schedule(bank_key, lambda count: self._generate_models(
+                    generator, topic, question_type, difficulty, count, batch_size=batch_size
+                )[0])
+        
+        return [self._to_quiz_question(q, question_type) for q in questions], errors
+        
+    def generate_questions(self,generator:QuestionGenerator,topic:str,question_type:str,difficulty:str,num_questions:int, progress_callback=None, max_workers=None, batch_size=None):
+        import streamlit as st
+        self.questions=[]
+        self.user_answers=[]
+        self.results=[]
+        self.score=None
+        
+        self.questions, errors=self.collect_questions(
+            generator, topic, question_type, difficulty, num_questions,
+            progress_callback=progress_callback, max_workers=max_workers, batch_size=batch_size
+        )
+        
+        if errors:
+            if not self.questions:
+                st.error(f"Error generating questions: {errors[0]}")
+                return False
+            st.warning(f"{num_questions - len(self.questions)} of {num_questions} questions could not be generated, continuing with {len(self.questions)}.")
+        
+        return True
+
+    def generate_summary(self, generator: QuestionGenerator, topic: str):
+        import streamlit as st
+        try:
+            self.summary = generator.generate_summary(topic)
+            return True
+        except Exception as e:
+            st.error(f"Error generating summary: {e}")
+            return False
+
+    def generate_flashcards(self, generator: QuestionGenerator, topic: str, num_cards: int):
+        import streamlit as st
+        try:
+            flashcard_set = generator.generate_flashcards(topic, num_cards)
+            self.flashcards = flashcard_set.flashcards
+            return True
+        except Exception as e:
+            st.error(f"Error generating flashcards: {e}")
+            return False
+                    
+    def attempt_quiz(self):
+        import streamlit as st
+        self.user_answers = []
+        for i,q in enumerate(self.questions):
+            st.markdown(f"**Question {i+1}: {q.question}**")
+            
+            if q.is_mcq:
+                user_answer=st.radio(
+                    f"Select an option:", 
+                    q.options,
+                    key=f"mcq_{i}",
+                    index=None)
+                self.user_answers.append(user_answer)
+            else:
+                user_answer=st.text_input(
+                    f"Fill in the blank for Question {i+1}:", 
+                    key=f"fill_blank_{i}"
+                )
+                self.user_answers.append(user_answer)
+    
+    def evaluate_quiz(self):
+        """Scores the attempt once; reruns read ``results`` and the cached ``score`` instead of rescoring."""
+        self.results=[]
+        
+        for i,(q,user_answer) in enumerate(zip(self.questions,self.user_answers)):
+            if q.is_mcq:
+                is_correct=user_answer==q.correct_answer
+            else:
+                is_correct=(user_answer or "").strip().lower()==q.correct_answer.strip().lower()
+                
+            self.results.append(QuizResult(
+                question_number=i+1,
+                question=q.question,
+                question_type=q.type,
+                user_answer=user_answer,
+                correct_answer=q.correct_answer,
+                is_correct=is_correct,
+                options=q.options,
+                explanation=q.explanation or "No explanation provided."
+            ))
+        
+        self.score=(sum(r.is_correct for r in self.results), len(self.results))
+            
+    def get_results_dataframe(self):
+        """Builds a DataFrame for export; rendering reads ``results`` directly."""
+        # pandas is only needed once results are exported
+        import pandas as pd
+        if not self.results:
+            return pd.DataFrame()
+        
+        return pd.DataFrame([r.to_dict() for r in self.results])
+    
+    def save_to_csv(self,filename_prefix="quiz_results"):
+        import streamlit as st
+        if not self.results:
+            st.warning("No results to save !!")
+            return None
+        
+        df=self.get_results_dataframe()
+        
+        from datetime import datetime
+        timestamp=datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename=f"{filename_prefix}_{timestamp}.csv"
+        
+        os.makedirs('results', exist_ok=True)
+        full_path=os.path.join('results', filename)
+        
+        try:
+            df.to_csv(full_path, index=False)
+            st.success(f"Results saved to {full_path}")
+            return full_path
+        except Exception as e:
+            st.error(f"Error saving results: {e}")
+            return None
\ No newline at end of file
@@ -0,0 +1,93 @@
+import re
+from collections import Counter
+from typing import List, Tuple
+
+import numpy as np
+
+from src.utils.chunking import estimate_tokens, split_into_chunks
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from has have he her his how i if in into is it its "
+    "not of on or our she so than that the their them then there these they this to was we were what "
+    "when which who will with would you your also may more most such other some only one two".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+class BM25Index:
+    """In-memory BM25 over a list of chunks, stored as an inverted index.
+
+    Postings are flat numpy arrays grouped by term (a column-compressed sparse matrix), so memory grows
+    with the number of distinct (chunk, term) pairs rather than chunks x vocabulary.
+    """
+
+    def __init__(self, chunks: List[str], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        docs = [Counter(tokenize(chunk)) for chunk in chunks]
+        self.vocab = {term: i for i, term in enumerate(sorted({t for doc in docs for t in doc}))}
+
+        rows = np.fromiter((row for row, doc in enumerate(docs) for _ in doc), dtype=np.int32)
+        cols = np.fromiter((self.vocab[term] for doc in docs for term in doc), dtype=np.int32)
+        tf = np.fromiter((count for doc in docs for count in doc.values()), dtype=np.float32)
+
+        doc_len = np.bincount(rows, weights=tf, minlength=len(chunks)).astype(np.float32)
+        avg_len = max(float(doc_len.mean()), 1.0) if len(chunks) else 1.0
+        df = np.bincount(cols, minlength=len(self.vocab))
+        self.idf = np.log1p((len(chunks) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * doc_len[rows] / avg_len)
+        weights = self.idf[cols] * tf * (k1 + 1) / (tf + norm + 1e-9)
+
+        order = np.argsort(cols, kind="stable")
+        self._postings_docs = rows[order]
+        self._postings_weights = weights[order].astype(np.float32)
+        self._indptr = np.concatenate(([0], np.cumsum(df)))
+        self._term_weights = np.bincount(cols, weights=weights, minlength=len(self.vocab))
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            i = self.vocab.get(term)
+            if i is not None:
+                start, stop = self._indptr[i], self._indptr[i + 1]
+                # A term appears at most once per chunk in its postings, so plain fancy-index addition is safe
+                scores[self._postings_docs[start:stop]] += count * self._postings_weights[start:stop]
+        return scores
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        scores = self.scores(query)
+        top = np.argsort(-scores)[:k]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+    def top_terms(self, n: int) -> List[str]:
+        """Most characteristic terms of the document, ranked by total BM25 weight."""
+        terms = list(self.vocab)
+        ranked = np.argsort(-self._term_weights)[:n]
+        return [terms[i] for i in ranked]
+
+    def distinct_slices(self, n: int) -> List[str]:
+        """One relevant chunk per key term, avoiding reuse until every chunk has been handed out."""
+        if not self.chunks:
+            return []
+        terms = self.top_terms(n) or [""]
+        used = np.zeros(len(self.chunks), dtype=bool)
+        slices = []
+        for i in range(n):
+            if used.all():
+                used[:] = False
+            scores = self.scores(terms[i % len(terms)])
+            scores[used] = -np.inf
+            best = int(np.argmax(scores))
+            used[best] = True
+            slices.append(self.chunks[best])
+        return slices
+
+
+def build_question_contexts(text: str, num_questions: int, chunk_tokens: int) -> List[str]:
+    """Returns one source slice per question; short topics are used as-is."""
+    if estimate_tokens(text) <= chunk_tokens:
+        return [text] * num_questions
+    return BM25Index(split_into_chunks(text, chunk_tokens)).distinct_slices(num_questions)
@@ -0,0 +1,46 @@
+import re
+import zlib
+
+import numpy as np
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def char_ngram_vector(text: str, n: int = 3, dim: int = 4096) -> np.ndarray:
+    """L2-normalized hashed character n-gram counts of the normalized text."""
+    padded = f" {normalize_text(text)} "
+    vector = np.zeros(dim, dtype=np.float32)
+    if len(padded) < n:
+        return vector
+    buckets = [zlib.crc32(padded[i:i + n].encode("utf-8")) % dim for i in range(len(padded) - n + 1)]
+    np.add.at(vector, buckets, 1.0)
+    return vector / np.linalg.norm(vector)
+
+
+class NearDuplicateFilter:
+    """Rejects texts whose n-gram cosine similarity to anything accepted so far reaches ``threshold``."""
+
+    def __init__(self, threshold: float = 0.85, n: int = 3, dim: int = 4096):
+        self.threshold = threshold
+        self.n = n
+        self.dim = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self.rejected = 0
+
+    def max_similarity(self, text: str) -> float:
+        if not len(self._vectors):
+            return 0.0
+        return float((self._vectors @ char_ngram_vector(text, self.n, self.dim)).max())
+
+    def add(self, text: str) -> bool:
+        """Accepts ``text`` and returns True unless it is a near-duplicate of an accepted one."""
+        vector = char_ngram_vector(text, self.n, self.dim)
+        if len(self._vectors) and float((self._vectors @ vector).max()) >= self.threshold:
+            self.rejected += 1
+            return False
+        self._vectors = np.vstack([self._vectors, vector])
+        return True
@@ -0,0 +1,13 @@
+import os
+import tempfile
+
+# Tests use fake LLMs; keep the process-wide limiter out of the way and never need a real key
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("RATE_LIMIT_RPM", "0")
+os.environ.setdefault("RATE_LIMIT_TPM", "0")
+os.environ.setdefault("QUESTION_BANK_ENABLED", "false")
+os.environ.setdefault("SESSION_STORE", "")
+os.environ.setdefault("STUDY_SET_LIBRARY_PATH", "")
+# Fakes replace the default model's runnables; routing is exercised explicitly in test_router
+os.environ.setdefault("MODEL_ROUTING_ENABLED", "false")
+os.environ.setdefault("LOG_DIR", os.path.join(tempfile.gettempdir(), "studyai-test-logs"))
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.config.setting import settings
+from src.models.summary_schema import SummarySchema
+
+
+class FakeGenerator:
+    def generate_summary(self, topic):
+        return SummarySchema(main_idea=topic, key_points=["point"])
+
+    def generate_mcq_batch(self, topic, difficulty="medium", num_questions=5, variant=None):
+        return [
+            SimpleNamespace(question=f"Q{i}", options=["a", "b", "c", "d"], correct_answer="a", explanation="because")
+            for i in range(num_questions)
+        ]
+
+
+def test_summary_and_quiz_endpoints(monkeypatch):
+    monkeypatch.setattr(server, "_generator", FakeGenerator())
+    client = TestClient(server.app)
+
+    response = client.post("/summary", json={"content": "Photosynthesis"})
+    assert response.status_code == 200
+    assert response.json()["main_idea"] == "Photosynthesis"
+
+    response = client.post("/quiz", json={"content": "Photosynthesis", "num_questions": 3})
+    assert response.status_code == 200
+    assert [q["question"] for q in response.json()["questions"]] == ["Q0", "Q1", "Q2"]
+
+
+def test_requests_are_validated():
+    client = TestClient(server.app)
+
+    assert client.post("/quiz", json={"content": "x", "num_questions": 50}).status_code == 422
+    assert client.post("/flashcards", json={"content": ""}).status_code == 422
+
+
+def test_oversized_content_is_rejected(monkeypatch):
+    monkeypatch.setattr(server, "_generator", FakeGenerator())
+    client = TestClient(server.app)
+
+    response = client.post("/summary", json={"content": "x" * (settings.PDF_MAX_CHARS + 1)})
+    assert response.status_code == 422
+
+
+def test_api_server_does_not_import_streamlit():
+    import subprocess
+    import sys
+
+    code = "import sys, src.api.server; print('streamlit' in sys.modules)"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
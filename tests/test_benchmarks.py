@@ -0,0 +1,50 @@
+import json
+
+from benchmarks.run_benchmarks import compare, main
+from benchmarks.startup_profile import profile
+from src.llm.fake_llm import FakeChatModel
+from src.models.question_schemas import MCQQuestionBatch
+
+
+def test_fake_llm_returns_schema_valid_batches():
+    llm = FakeChatModel(latency=0, seed=1)
+    result = llm.with_structured_output(MCQQuestionBatch, include_raw=True).invoke("Generate 3 distinct easy questions")
+
+    assert result["parsing_error"] is None
+    assert len(result["parsed"].questions) == 3
+    assert all(q.correct_answer in q.options for q in result["parsed"].questions)
+
+
+def test_benchmark_run_writes_results_and_flags_regressions(tmp_path):
+    output = tmp_path / "results.json"
+    argv = [
+        "--quiz-sizes", "3", "--concurrency", "2", "--pdf-pages", "2", "--repeat", "1",
+        "--source-sentences", "20", "--latency", "0", "--jitter", "0", "--failure-rate", "0",
+        "--output", str(output),
+    ]
+
+    assert main(argv) == 0
+    report = json.loads(output.read_text())
+    names = [r["name"] for r in report["results"]]
+    assert "summary" in names and "pdf_extract[pages=2]" in names
+    assert all(r["completion_rate"] == 1.0 for r in report["results"] if r["name"].startswith("quiz"))
+
+    baseline = {"results": [
+        {"name": "quiz", "seconds": {"p50": 1.0}, "llm_calls": 10, "completion_rate": 1.0},
+        {"name": "pdf", "seconds": {"p50": 0.05}},
+    ]}
+    slower = [
+        {"name": "quiz", "seconds": {"p50": 2.0}, "llm_calls": 20, "completion_rate": 0.5},
+        {"name": "pdf", "seconds": {"p50": 0.5}},
+    ]
+    regressions = compare(slower, baseline, 0.25)
+    # CPU-bound scenarios are not timed against a baseline from another machine
+    assert {(r["name"], r["metric"]) for r in regressions} == {("quiz", "llm_calls"), ("quiz", "p50_seconds"), ("quiz", "completion_rate")}
+    assert compare(baseline["results"], baseline, 0.25) == []
+
+
+def test_app_cold_start_skips_deferred_dependencies():
+    report = profile("app", top=3)
+
+    assert report["import_seconds"] > 0
+    assert not {"pandas", "PyPDF2", "langchain_groq"} & set(report["deferred_modules_loaded"])
@@ -0,0 +1,18 @@
+from src.utils.chunking import estimate_tokens, split_into_chunks
+
+
+def test_chunks_respect_token_budget_and_overlap():
+    text = " ".join(f"Sentence number {i} is here." for i in range(50))
+
+    chunks = split_into_chunks(text, chunk_tokens=30, overlap_tokens=10)
+
+    assert all(estimate_tokens(chunk) <= 30 for chunk in chunks)
+    assert chunks[0].startswith("Sentence number 0 ")
+    assert chunks[-1].endswith("Sentence number 49 is here.")
+    # The last sentence of a chunk is repeated at the start of the next one
+    assert chunks[1].startswith(chunks[0].split(". ")[-1])
+
+
+def test_short_text_is_a_single_chunk():
+    assert split_into_chunks("Photosynthesis", chunk_tokens=100) == ["Photosynthesis"]
+    assert split_into_chunks("   ", chunk_tokens=100) == []
@@ -0,0 +1,16 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from src.generator.question_generator import QuestionGenerator
+from src.llm.groq_client import get_groq_llm, get_structured_llm
+from src.models.question_schemas import MCQQuestion
+
+
+def test_llm_and_structured_runnables_are_shared():
+    assert get_groq_llm() is get_groq_llm()
+    assert get_structured_llm(MCQQuestion) is get_structured_llm(MCQQuestion)
+
+    first, second = QuestionGenerator(), QuestionGenerator()
+    assert first.llm is second.llm
+    assert first.mcq_llm is second.mcq_llm
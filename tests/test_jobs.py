@@ -0,0 +1,169 @@
+import threading
+
+import pytest
+
+from src.config.setting import settings
+from src.generator.jobs import JobStore, LocalJobQueue, RedisJobStore, apply_job, run_generation_job
+from src.models.flashcard_schema import Flashcard, FlashcardSet
+from src.models.question_schemas import FillBlankQuestion
+from src.models.summary_schema import SummarySchema
+from src.utils.quiz_manager import QuizManager
+
+
+class LocalRedis:
+    """In-process stand-in for the string, hash and list commands RedisJobStore uses; values come back as bytes like redis-py."""
+
+    def __init__(self):
+        self.values, self.hashes, self.lists, self.ttls = {}, {}, {}, {}
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def set(self, key, value, ex=None):
+        self.values[key] = self._bytes(value)
+        self.ttls[key] = ex
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.hashes.setdefault(key, {})
+        for name, item in {**(mapping or {}), **({field: value} if field is not None else {})}.items():
+            fields[self._bytes(name)] = self._bytes(item)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(self._bytes(v) for v in values)
+
+    def lrange(self, key, start, stop):
+        return list(self.lists.get(key, []))
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "redis":
+        return RedisJobStore(LocalRedis(), retention_seconds=60)
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+class FlakyGenerator:
+    def __init__(self, working_batches=None, cards_fail=False, first_subject=0):
+        self.first_subject = first_subject
+        self.working_batches = working_batches
+        self.cards_fail = cards_fail
+        self.summary_calls = 0
+        self.requested_questions = 0
+
+    def stream_summary(self, topic):
+        self.summary_calls += 1
+        yield SummarySchema(main_idea=topic, key_points=["point"])
+
+    def stream_flashcards(self, topic, num_cards=5):
+        if self.cards_fail:
+            raise RuntimeError("flashcards unavailable")
+        yield FlashcardSet(flashcards=[Flashcard(front=f"F{i}", back="B") for i in range(num_cards)])
+
+    def generate_fill_blank_batch(self, topic, difficulty="medium", num_questions=5, variant=None):
+        if self.working_batches is not None:
+            if self.working_batches == 0:
+                raise RuntimeError("service unavailable")
+            self.working_batches -= 1
+        start = self.first_subject + self.requested_questions
+        self.requested_questions += num_questions
+        subjects = ["sky", "grass", "sun", "ocean", "snow", "rain"]
+        return [
+            FillBlankQuestion(question=f"The {subjects[start + i]} is _____.", answer="colored", explanation="Look.")
+            for i in range(num_questions)
+        ]
+
+
+def test_resumed_job_keeps_finished_stages_and_saved_questions(store, monkeypatch):
+    monkeypatch.setattr(settings, "QUESTION_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "QUESTION_CONCURRENCY", 1)
+    job_id = store.create({"topic": "topic", "question_type": "Fill in the Blank", "difficulty": "Easy", "num_questions": 4, "num_cards": 2})
+
+    run_generation_job(store, job_id, lambda: FlakyGenerator(working_batches=1, cards_fail=True))
+    job = store.get(job_id)
+    assert job.status == "failed"
+    assert job.stage_status("summary") == "done" and job.stage_status("flashcards") == "error"
+    assert len(job.questions) == 2
+
+    retry = FlakyGenerator(first_subject=2)
+    run_generation_job(store, job_id, lambda: retry)
+    job = store.get(job_id)
+    assert job.status == "done"
+    assert retry.summary_calls == 0
+    assert retry.requested_questions == 2
+
+    manager = QuizManager()
+    assert apply_job(job, manager)
+    assert [q.question for q in manager.questions][:2] == ["The sky is _____.", "The grass is _____."]
+    assert len(manager.questions) == 4 and len(manager.flashcards) == 2
+    assert manager.summary.main_idea == "topic"
+
+
+def test_local_queue_ignores_duplicate_submits_while_running():
+    release = threading.Event()
+    ran = []
+    queue = LocalJobQueue(lambda job_id: (ran.append(job_id), release.wait(5)), max_workers=2)
+
+    assert queue.submit("job")
+    assert not queue.submit("job")
+    assert queue.is_active("job")
+    release.set()
+    queue._executor.shutdown(wait=True)
+
+    assert ran == ["job"]
+    assert not queue.is_active("job")
+
+
+def test_redis_job_store_expires_every_job_key():
+    client = LocalRedis()
+    store = RedisJobStore(client, retention_seconds=60)
+    job_id = store.create({"num_questions": 1})
+    store.add_questions(job_id, [{"question": "q"}])
+
+    assert store.get(job_id).questions == [{"question": "q"}]
+    assert store.get("missing") is None
+    assert all(client.ttls[key] == 60 for key in store._keys(job_id))
+
+    store.create({"topic": "topic", "num_questions": 1})
+    assert [ttl for key, ttl in client.ttls.items() if ":source:" in key] == [60]
+
+
+def test_source_is_stored_once_and_kept_out_of_polled_records(store):
+    source = "Photosynthesis turns light into chemical energy. " * 1000
+    first = store.create({"topic": source, "num_questions": 1})
+    second = store.create({"topic": source, "num_questions": 2})
+
+    job = store.get(first)
+    assert "topic" not in job.params
+    assert job.params["source_digest"] == store.get(second).params["source_digest"]
+    assert store.get_source(job.params["source_digest"]) == source
+
+
+def test_streamed_partials_are_written_at_most_once_per_poll_interval(store, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_POLL_SECONDS", 60)
+
+    class StreamingGenerator(FlakyGenerator):
+        def stream_summary(self, topic):
+            for i in range(1, 51):
+                yield SummarySchema(main_idea=topic, key_points=[f"point {n}" for n in range(i)])
+
+    writes = []
+    set_stage = store.set_stage
+    monkeypatch.setattr(store, "set_stage", lambda job_id, stage, status, *args, **kwargs: (
+        writes.append((stage, status)), set_stage(job_id, stage, status, *args, **kwargs)))
+    job_id = store.create({"topic": "topic", "question_type": "Fill in the Blank", "difficulty": "Easy", "num_questions": 1, "num_cards": 1})
+
+    run_generation_job(store, job_id, StreamingGenerator)
+
+    assert writes.count(("summary", "partial")) == 1
+    assert ("summary", "done") in writes
+    assert len(store.get(job_id).stages["summary"]["value"]["key_points"]) == 50
@@ -0,0 +1,52 @@
+import io
+import json
+import logging
+import threading
+
+from src.common import logger as logger_module
+from src.common.logger import JsonFormatter, configure_logging, get_logger, shutdown_logging
+
+
+class RecordsFormattingThread:
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread().name
+        return "payload"
+
+
+def test_records_are_formatted_on_the_writer_thread_as_json():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    shutdown_logging()
+    configure_logging(handler)
+    try:
+        arg = RecordsFormattingThread()
+        get_logger("test").info("value: %s", arg)
+    finally:
+        shutdown_logging()
+        configure_logging()
+
+    entry = json.loads(stream.getvalue().splitlines()[-1])
+    assert entry["message"] == "value: payload"
+    assert entry["logger"] == "test" and entry["level"] == "INFO"
+    assert arg.thread != threading.current_thread().name
+
+
+def test_writer_thread_starts_on_first_record_not_on_get_logger(monkeypatch):
+    stream = io.StringIO()
+    monkeypatch.setattr(logger_module, "_build_file_handler", lambda: logging.StreamHandler(stream))
+    shutdown_logging()
+    try:
+        logger = get_logger("lazy")
+        assert logger_module._listener is None
+
+        logger.warning("started")
+        assert logger_module._listener is not None
+    finally:
+        shutdown_logging()
+        get_logger("lazy")
+
+    assert "started" in stream.getvalue()
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from src.common.metrics import MetricsRegistry, metrics, timed
+from src.generator.question_generator import QuestionGenerator
+from src.models.summary_schema import SummarySchema
+
+
+def test_prometheus_exposition_of_counters_and_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.inc("studyai_llm_requests_total", help="LLM requests sent", schema="MCQQuestion")
+    registry.observe("studyai_stage_duration_seconds", 0.5, stage="quiz")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE studyai_llm_requests_total counter" in text
+    assert 'studyai_llm_requests_total{schema="MCQQuestion"} 1' in text
+    assert 'studyai_stage_duration_seconds_bucket{stage="quiz",le="0.1"} 0' in text
+    assert 'studyai_stage_duration_seconds_bucket{stage="quiz",le="1.0"} 1' in text
+    assert 'studyai_stage_duration_seconds_count{stage="quiz"} 1' in text
+
+
+def test_timed_records_errors():
+    registry_before = metrics.render_prometheus()
+    try:
+        with timed("unit_test_stage"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    assert 'stage="unit_test_stage",status="error"' in metrics.render_prometheus()
+    assert 'stage="unit_test_stage"' not in registry_before
+
+
+def test_generator_records_token_usage_from_raw_message():
+    class RawStructuredLLM:
+        def invoke(self, prompt):
+            raw = SimpleNamespace(usage_metadata={"input_tokens": 120, "output_tokens": 30})
+            return {"raw": raw, "parsed": SummarySchema(main_idea="idea", key_points=[]), "parsing_error": None}
+
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.summary_llm = RawStructuredLLM()
+    before = metrics.get("studyai_llm_tokens_total", schema="SummarySchema", kind="prompt")
+
+    assert generator.generate_summary("content").main_idea == "idea"
+    assert metrics.get("studyai_llm_tokens_total", schema="SummarySchema", kind="prompt") == before + 120
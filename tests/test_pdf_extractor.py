@@ -0,0 +1,48 @@
+from benchmarks.fixtures import make_pdf
+from src.config.setting import settings
+from src.utils import pdf_extractor
+from src.utils.pdf_extractor import extract_text_from_pdf, iter_pdf_pages
+
+
+def test_extraction_stops_once_enough_characters_are_read():
+    pdf = make_pdf([f"Page number {i}" for i in range(10)])
+
+    assert list(iter_pdf_pages(pdf, max_pages=2)) == ["Page number 0", "Page number 1"]
+    assert extract_text_from_pdf(pdf, max_chars=20) == "Page number 0\nPage n"
+
+
+def test_extraction_enforces_page_and_byte_caps(monkeypatch):
+    pdf = make_pdf([f"Page {i}" for i in range(5)])
+
+    assert extract_text_from_pdf(pdf, max_pages=2) == "Page 0\nPage 1"
+
+    monkeypatch.setattr(settings, "PDF_MAX_FILE_BYTES", 10)
+    assert extract_text_from_pdf(pdf).startswith("Error")
+
+
+def test_parallel_extraction_keeps_page_order(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 2)
+    pdf = make_pdf([f"Page {i}" for i in range(6)])
+
+    assert extract_text_from_pdf(pdf) == "\n".join(f"Page {i}" for i in range(6))
+
+
+def test_parallel_extraction_warns_about_ignored_pages(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 2)
+    warnings = []
+    monkeypatch.setattr(pdf_extractor.logger, "warning", lambda msg, *args: warnings.append(msg % args))
+    pdf = make_pdf([f"Long page {i}" for i in range(6)])
+
+    assert extract_text_from_pdf(pdf, max_pages=4) == "\n".join(f"Long page {i}" for i in range(4))
+    assert warnings == ["PDF has more than 4 pages, ignoring the rest"]
+
+
+def test_extracted_text_is_cached_by_file_digest(monkeypatch):
+    pdf = make_pdf(["Cached page"])
+    assert extract_text_from_pdf(pdf) == "Cached page"
+
+    def fail(*args):
+        raise AssertionError("PDF parsed again")
+
+    monkeypatch.setattr(pdf_extractor, "_extract_text", fail)
+    assert extract_text_from_pdf(pdf) == "Cached page"
@@ -0,0 +1,63 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from src.common.metrics import metrics
+from src.config.setting import settings
+from src.generator.question_generator import QuestionGenerator
+from src.models.flashcard_schema import Flashcard, FlashcardSet
+from src.prompts.budget import fit_to_tokens, normalize_source, render_prompt
+from src.prompts.templates import mcq_batch_prompt_template
+from src.utils.chunking import estimate_tokens
+
+
+def test_normalize_source_drops_page_boilerplate_and_keeps_paragraphs():
+    pages = [
+        f"ACME Biology Course\nPhotosynthesis   step {i} turns light into\nchemi-\ncal energy {i}.\n\nChlorophyll absorbs light {i}.\nPage {i} of 3"
+        for i in range(1, 4)
+    ]
+
+    text = normalize_source("\n".join(pages))
+
+    assert "ACME Biology Course" not in text
+    assert "Page" not in text
+    assert "Photosynthesis step 2 turns light into chemical energy 2." in text
+    assert "\n\n" in text
+
+
+def test_fit_to_tokens_cuts_on_sentence_boundaries():
+    text = " ".join(f"Sentence number {i} is here." for i in range(50))
+
+    fitted = fit_to_tokens(text, 40)
+
+    assert estimate_tokens(fitted) <= 40
+    assert fitted.endswith("is here.")
+    assert fit_to_tokens("Short text.", 40) == "Short text."
+
+
+def test_render_prompt_fits_budget_and_reports_savings():
+    source = " ".join(f"Fact {i} about cells and energy." for i in range(500))
+    before = metrics.get("studyai_prompt_tokens_total", schema="Test", kind="saved")
+
+    prompt = render_prompt(mcq_batch_prompt_template, "Test", max_input_tokens=200, topic=source, difficulty="easy", num_questions=3)
+
+    assert estimate_tokens(prompt) <= 200
+    assert prompt.startswith("Generate 3 distinct easy")
+    assert metrics.get("studyai_prompt_tokens_total", schema="Test", kind="saved") - before > 0
+
+
+def test_flashcard_prompt_uses_flashcard_budget():
+    class FakeStructuredLLM:
+        prompts = []
+
+        def invoke(self, prompt):
+            self.prompts.append(prompt)
+            return FlashcardSet(flashcards=[Flashcard(front="f", back="b")])
+
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.flashcard_llm = FakeStructuredLLM()
+
+    generator.generate_flashcards(" ".join(f"Fact {i} about cells." for i in range(2000)), 1)
+
+    assert estimate_tokens(generator.flashcard_llm.prompts[0]) <= settings.FLASHCARD_INPUT_TOKENS
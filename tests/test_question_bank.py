@@ -0,0 +1,40 @@
+from src.cache.question_bank import QuestionBank, QuestionBankPrefiller, question_fingerprint
+from src.models.question_schemas import MCQQuestion
+
+
+def make_mcq(i):
+    return MCQQuestion(question=f"Question {i}?", options=["a", "b", "c", "d"], correct_answer="a", explanation="e")
+
+
+def test_bank_deduplicates_and_samples_by_key(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.db"))
+    key = QuestionBank.make_key("source text", "Multiple Choice", "Easy")
+
+    assert bank.add(key, [make_mcq(1), make_mcq(2)]) == 2
+    assert bank.add(key, [make_mcq(2), make_mcq(3)]) == 1
+    assert bank.count(key) == 3
+    assert bank.count(QuestionBank.make_key("source text", "Multiple Choice", "Hard")) == 0
+
+    sample = bank.sample(key, MCQQuestion, 5)
+    assert sorted(q.question for q in sample) == ["Question 1?", "Question 2?", "Question 3?"]
+
+    sample = bank.sample(key, MCQQuestion, 5, exclude=[question_fingerprint("question 2?")])
+    assert sorted(q.question for q in sample) == ["Question 1?", "Question 3?"]
+
+
+def test_prefiller_tops_up_to_target(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.db"))
+    prefiller = QuestionBankPrefiller(bank, target=4)
+    key = QuestionBank.make_key("source text", "Multiple Choice", "Easy")
+    bank.add(key, [make_mcq(0)])
+    requested = []
+
+    def produce(count):
+        requested.append(count)
+        return [make_mcq(i) for i in range(1, count + 1)]
+
+    prefiller.schedule(key, produce)
+    prefiller.join()
+
+    assert requested == [3]
+    assert bank.count(key) == 4
@@ -0,0 +1,178 @@
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from src.cache.response_cache import LRUCache, ResponseCache
+from src.generator.question_generator import QuestionGenerator
+from src.models.question_schemas import MCQQuestion, MCQQuestionBatch
+from src.models.summary_schema import SummarySchema
+from src.config.setting import settings
+
+
+def make_mcq(i, valid=True):
+    options = ["a", "b", "c", "d"] if valid else ["a", "b"]
+    return MCQQuestion(question=f"Q{i}", options=options, correct_answer="a", explanation="because")
+
+
+class FakeStructuredLLM:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+def test_mcq_batch_regenerates_only_invalid_items():
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.mcq_batch_llm = FakeStructuredLLM([
+        MCQQuestionBatch(questions=[make_mcq(0), make_mcq(1, valid=False), make_mcq(2)]),
+        MCQQuestionBatch(questions=[make_mcq(3)]),
+    ])
+
+    questions = generator.generate_mcq_batch("topic", "easy", 3)
+
+    assert [q.question for q in questions] == ["Q0", "Q2", "Q3"]
+    assert "Generate 3 distinct" in generator.mcq_batch_llm.prompts[0]
+    assert "Generate 1 distinct" in generator.mcq_batch_llm.prompts[1]
+
+
+def test_batch_keeps_the_cause_and_does_not_retry_non_validation_errors():
+    import pytest
+    from src.common.custom_exception import CustomException
+
+    class Unauthorized(Exception):
+        status_code = 401
+
+    class DeniedLLM:
+        calls = 0
+
+        def invoke(self, prompt):
+            self.calls += 1
+            raise Unauthorized("Invalid API key")
+
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.mcq_batch_llm = DeniedLLM()
+
+    with pytest.raises(CustomException, match="Invalid API key"):
+        generator.generate_mcq_batch("topic", "easy", 3)
+    assert generator.mcq_batch_llm.calls == 1
+
+
+def test_map_step_is_capped_for_very_long_sources(monkeypatch):
+    monkeypatch.setattr(settings, "CHUNK_TOKENS", 20)
+    monkeypatch.setattr(settings, "CHUNK_OVERLAP_TOKENS", 0)
+    monkeypatch.setattr(settings, "PROMPT_INPUT_TOKENS", 60)
+    monkeypatch.setattr(settings, "SUMMARY_MAX_CHUNKS", 4)
+
+    chunks = QuestionGenerator()._summary_chunks(" ".join(f"Fact number {i} matters." for i in range(200)))
+
+    assert len(chunks) == 4
+    assert chunks[0].startswith("Fact number 0 ")
+    # Sampled evenly, so the end of the source is still represented
+    assert int(chunks[-1].split()[2]) >= 100
+
+
+def test_summary_is_served_from_cache():
+    generator = QuestionGenerator()
+    generator.cache = ResponseCache(LRUCache(max_entries=8))
+    generator.summary_llm = FakeStructuredLLM([SummarySchema(main_idea="idea", key_points=["a"])])
+
+    first = generator.generate_summary("same content")
+    second = generator.generate_summary("same content")
+
+    assert first == second
+    assert len(generator.summary_llm.prompts) == 1
+    assert generator.cache.stats()["hits"] == 1
+
+
+def test_long_content_is_summarized_with_map_reduce(monkeypatch):
+    monkeypatch.setattr(settings, "CHUNK_TOKENS", 20)
+    monkeypatch.setattr(settings, "CHUNK_OVERLAP_TOKENS", 0)
+    monkeypatch.setattr(settings, "SUMMARY_MAX_FANOUT", 2)
+
+    class EchoSummaryLLM:
+        def __init__(self):
+            self.prompts = []
+
+        def invoke(self, prompt):
+            self.prompts.append(prompt)
+            return SummarySchema(main_idea=f"summary {len(self.prompts)}", key_points=["p"])
+
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.summary_llm = EchoSummaryLLM()
+
+    generator.generate_summary(" ".join(f"Fact number {i} matters." for i in range(12)))
+
+    # 4 chunks -> 2 reduce calls -> 1 final reduce call
+    assert len(generator.summary_llm.prompts) == 7
+    assert all("Section 3" not in p for p in generator.summary_llm.prompts)
+
+
+def test_summary_streams_partial_key_points():
+    class FakeJsonLLM:
+        def stream(self, prompt):
+            text = '{"main_idea": "Plants make food", "key_points": ["Light", "Water"]}'
+            for i in range(0, len(text), 7):
+                yield SimpleNamespace(content=text[i:i + 7])
+
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.json_llm = FakeJsonLLM()
+
+    partials = list(generator.stream_summary("short content"))
+
+    assert partials[-1] == SummarySchema(main_idea="Plants make food", key_points=["Light", "Water"])
+    assert any(p.main_idea == "Plants make food" and p.key_points == ["Light"] for p in partials[:-1])
+    assert len(partials) > 3
+
+
+def test_easy_questions_route_to_the_fast_model_and_fail_over(monkeypatch):
+    from src.generator import question_generator
+    from src.llm.router import ModelRouter, Route
+
+    class Unavailable(Exception):
+        status_code = 503
+
+    class DownLLM:
+        def invoke(self, prompt):
+            raise Unavailable("fast model down")
+
+    fast = FakeStructuredLLM([MCQQuestionBatch(questions=[make_mcq(0)])])
+    monkeypatch.setattr(question_generator, "get_structured_llm", lambda schema, model=None: fast)
+    generator = QuestionGenerator()
+    generator.cache = None
+    generator.router = ModelRouter({"mcq:easy": Route("fast-model", settings.MODEL_NAME)}, hedge_after=0)
+    generator.mcq_batch_llm = FakeStructuredLLM([MCQQuestionBatch(questions=[make_mcq(1)])])
+
+    assert [q.question for q in generator.generate_mcq_batch("topic", "easy", 1)] == ["Q0"]
+    fast.responses = []
+    fast.invoke = DownLLM().invoke
+    assert [q.question for q in generator.generate_mcq_batch("topic", "Easy", 1)] == ["Q1"]
+    assert [d["model"] for d in generator.router.snapshot()["decisions"]] == ["fast-model", settings.MODEL_NAME]
+
+
+def test_failed_stream_releases_coalesced_followers():
+    import pytest
+    from src.cache.single_flight import SingleFlight
+    from src.common.custom_exception import CustomException
+
+    class BrokenJsonLLM:
+        def stream(self, prompt):
+            yield SimpleNamespace(content="not json")
+
+    generator = QuestionGenerator()
+    generator.cache = ResponseCache(LRUCache(max_entries=8))
+    generator.single_flight = SingleFlight()
+    generator.json_llm = BrokenJsonLLM()
+    generator.summary_llm = FakeStructuredLLM([None, None])
+
+    for _ in range(2):
+        with pytest.raises(CustomException):
+            list(generator.stream_summary("hello world"))
+        assert generator.single_flight.stats()["in_flight"] == 0
@@ -0,0 +1,158 @@
+import random
+import time
+import threading
+
+from src.models.question_schemas import MCQQuestion
+from src.models.quiz_records import QuizQuestion
+from src.utils.quiz_manager import QuizManager
+
+
+class FakeGenerator:
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_mcq(self, topic, difficulty="medium", variant=None):
+        with self.lock:
+            index = self.calls
+            self.calls += 1
+        # Later calls tend to finish first, with jitter, so completion order differs from request order
+        time.sleep(0.01 * (5 - index % 5) + random.uniform(0, 0.01))
+        if index in self.fail_on:
+            raise RuntimeError(f"boom {index}")
+        # Single-question slots are labelled by the slot they were submitted for, not by arrival
+        return MCQQuestion(
+            question=f"Q{index if variant is None else variant}",
+            options=["a", "b", "c", "d"],
+            correct_answer="a",
+            explanation="because",
+        )
+
+    def generate_mcq_batch(self, topic, difficulty="medium", num_questions=5, variant=None):
+        return [self.generate_mcq(topic, difficulty) for _ in range(num_questions)][:max(0, num_questions - 1)]
+
+
+def test_generate_questions_keeps_order_and_reports_progress():
+    manager = QuizManager()
+    progress = []
+
+    assert manager.generate_questions(
+        FakeGenerator(), "topic", "Multiple Choice", "Easy", 5,
+        progress_callback=progress.append, max_workers=5, batch_size=1
+    )
+
+    assert [q.question for q in manager.questions] == [f"Q{i}" for i in range(5)]
+    assert progress[-1] == 1.0
+    assert progress == sorted(progress)
+
+
+def test_generate_questions_keeps_partial_results():
+    manager = QuizManager()
+
+    assert manager.generate_questions(FakeGenerator(fail_on={1}), "topic", "Multiple Choice", "Easy", 4, max_workers=2, batch_size=1)
+    assert len(manager.questions) == 3
+
+    assert not manager.generate_questions(FakeGenerator(fail_on={0}), "topic", "Multiple Choice", "Easy", 1, batch_size=1)
+
+
+def test_generate_questions_in_batches_reports_shortfall():
+    manager = QuizManager()
+    progress = []
+
+    assert manager.generate_questions(
+        FakeGenerator(), "topic", "Multiple Choice", "Easy", 7,
+        progress_callback=progress.append, batch_size=3
+    )
+
+    # Each fake batch drops one item: 2 + 2 + 1 (the single-question batch goes through generate_mcq)
+    assert len(manager.questions) == 5
+    assert progress[-1] == 1.0
+
+
+def test_warm_question_bank_only_tops_up_the_shortfall(tmp_path, monkeypatch):
+    from src.cache.question_bank import QuestionBank
+    from src.utils import quiz_manager
+
+    bank = QuestionBank(str(tmp_path / "bank.db"))
+    key = QuestionBank.make_key("topic", "Multiple Choice", "Easy")
+    bank.add(key, [
+        MCQQuestion(question=f"Banked {i}", options=["a", "b", "c", "d"], correct_answer="a", explanation="e")
+        for i in range(3)
+    ])
+    monkeypatch.setattr(quiz_manager, "get_question_bank", lambda: bank)
+    monkeypatch.setattr(quiz_manager, "get_prefiller", lambda: None)
+    generator = FakeGenerator()
+
+    manager = QuizManager()
+    assert manager.generate_questions(generator, "topic", "Multiple Choice", "Easy", 4, batch_size=1)
+
+    assert generator.calls == 1
+    assert sum(q.question.startswith("Banked") for q in manager.questions) == 3
+
+
+def test_prefill_waits_for_repeated_requests(tmp_path, monkeypatch):
+    from src.cache.question_bank import QuestionBank
+    from src.utils import quiz_manager
+
+    class RecordingPrefiller:
+        scheduled = []
+
+        def schedule(self, bank_key, produce):
+            self.scheduled.append(bank_key)
+
+    prefiller = RecordingPrefiller()
+    monkeypatch.setattr(quiz_manager, "get_question_bank", lambda: QuestionBank(str(tmp_path / "bank.db")))
+    monkeypatch.setattr(quiz_manager, "get_prefiller", lambda: prefiller)
+    monkeypatch.setattr(quiz_manager.settings, "QUESTION_BANK_PREFILL_MIN_REQUESTS", 3)
+
+    scheduled = []
+    for _ in range(3):
+        QuizManager().collect_questions(FakeGenerator(), "topic", "Multiple Choice", "Easy", 1)
+        scheduled.append(len(prefiller.scheduled))
+
+    assert scheduled == [0, 0, 1]
+
+
+def test_near_duplicates_are_replaced():
+    class RepeatingGenerator:
+        def __init__(self):
+            self.variants = []
+
+        def generate_mcq_batch(self, topic, difficulty="medium", num_questions=5, variant=None):
+            self.variants.append(variant)
+            texts = ["What is the capital of France?", "What is the capital of France ?", "Which river flows through Paris?"]
+            start = 0 if variant == 0 else 2
+            return [
+                MCQQuestion(question=texts[start + i], options=["a", "b", "c", "d"], correct_answer="a", explanation="e")
+                for i in range(num_questions)
+            ]
+
+        def generate_mcq(self, topic, difficulty="medium", variant=None):
+            return self.generate_mcq_batch(topic, difficulty, 1, variant)[0]
+
+    manager = QuizManager()
+    generator = RepeatingGenerator()
+
+    assert manager.generate_questions(generator, "topic", "Multiple Choice", "Easy", 2, batch_size=2)
+
+    assert [q.question for q in manager.questions] == ["What is the capital of France?", "Which river flows through Paris?"]
+    assert generator.variants == [0, 2]
+
+
+def test_evaluate_quiz_scores_once_and_exports_on_demand():
+    manager = QuizManager()
+    manager.questions = [
+        QuizQuestion(type="MCQ", question="Q1", correct_answer="a", explanation="e", options=("a", "b")),
+        QuizQuestion(type="Fill in the Blank", question="Q2", correct_answer="Paris", explanation=""),
+    ]
+    manager.user_answers = ["b", " paris "]
+
+    manager.evaluate_quiz()
+
+    assert manager.score == (1, 2)
+    assert [r.is_correct for r in manager.results] == [False, True]
+    assert manager.results[1].explanation == "No explanation provided."
+    df = manager.get_results_dataframe()
+    assert list(df["question_number"]) == [1, 2]
+    assert df["options"][0] == ["a", "b"]
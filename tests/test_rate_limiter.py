@@ -0,0 +1,77 @@
+import pytest
+from types import SimpleNamespace
+
+from src.llm.rate_limiter import RateLimiter, backoff_delay, call_with_backoff, is_transient_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+
+class FakeLLM:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return f"answer to {prompt}"
+
+
+def test_limiter_enforces_requests_and_tokens_per_minute():
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire(100) == 0
+    assert limiter.acquire(100) == 0
+    # Third request in the same minute waits for one request slot (30s at 2 rpm)
+    assert limiter.acquire(100) == pytest.approx(30)
+
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire(400) == 0
+    # 200 tokens left, 200 more refill at 10 tokens/s
+    assert limiter.acquire(400) == pytest.approx(20)
+
+
+def test_backoff_honors_retry_after_and_caps_delay():
+    assert backoff_delay(10, base=1, cap=30, rng=lambda lo, hi: hi) == 30
+    assert backoff_delay(0, retry_after=7, base=1, cap=30, rng=lambda lo, hi: lo) == 7
+
+
+def test_call_with_backoff_retries_only_transient_errors():
+    slept = []
+    llm = FakeLLM([RateLimitError(retry_after="2"), RateLimitError()])
+
+    assert call_with_backoff(llm.invoke, "q", max_retries=3, sleep=slept.append) == "answer to q"
+    assert llm.calls == 3
+    assert 2 <= slept[0] <= 3
+
+    llm = FakeLLM([ValueError("bad output")])
+    with pytest.raises(ValueError):
+        call_with_backoff(llm.invoke, "q", max_retries=3, sleep=slept.append)
+    assert llm.calls == 1
+    assert not is_transient_error(ValueError())
+
+
+def test_call_with_backoff_does_not_stack_retries():
+    llm = FakeLLM([RateLimitError()] * 5)
+
+    with pytest.raises(RateLimitError):
+        call_with_backoff(llm.invoke, "q", max_retries=3, sleep=lambda s: None)
+    assert llm.calls == 3
@@ -0,0 +1,47 @@
+import time
+
+from src.cache.response_cache import LRUCache, ResponseCache, SQLiteCache, make_cache_key
+
+
+def test_make_cache_key_is_content_addressed():
+    assert make_cache_key("model", "prompt", 1) == make_cache_key("model", "prompt", 1)
+    assert make_cache_key("model", "prompt", 1) != make_cache_key("model", "prompt", 2)
+
+
+def test_lru_evicts_least_recently_used_and_expired_entries():
+    cache = LRUCache(max_entries=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_disk_tier_survives_restart_and_promotes_to_memory(tmp_path):
+    path = str(tmp_path / "responses.db")
+    ResponseCache(LRUCache(), SQLiteCache(path)).set("key", {"main_idea": "x"})
+
+    cache = ResponseCache(LRUCache(), SQLiteCache(path))
+    assert cache.get("key") == {"main_idea": "x"}
+    assert cache.get("key") == {"main_idea": "x"}
+
+    stats = cache.stats()
+    assert stats["disk"]["hits"] == 1
+    assert stats["memory"]["hits"] == 1
+    assert stats["misses"] == 0
+
+
+def test_disk_tier_caps_entries(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "responses.db"), max_entries=2)
+    for i in range(4):
+        disk.set(f"k{i}", i)
+
+    assert disk.stats()["size"] == 2
+    assert disk.get("k0") is None
+    assert disk.get("k3") == 3
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.utils.retrieval import BM25Index, build_question_contexts
+
+
+CHUNKS = [
+    "Chlorophyll absorbs light energy in the leaves of plants.",
+    "Mitochondria produce energy for the cell through respiration.",
+    "The Calvin cycle fixes carbon dioxide into sugar molecules.",
+]
+
+
+def test_search_ranks_relevant_chunk_first():
+    index = BM25Index(CHUNKS)
+
+    assert index.search("calvin cycle carbon", k=1)[0][0] == 2
+    assert index.search("unrelated words") == []
+
+
+def test_distinct_slices_cover_the_document_before_repeating():
+    slices = BM25Index(CHUNKS).distinct_slices(4)
+
+    assert len(slices) == 4
+    assert set(slices[:3]) == set(CHUNKS)
+
+
+def test_short_topics_are_used_as_is():
+    assert build_question_contexts("Photosynthesis", 3, chunk_tokens=300) == ["Photosynthesis"] * 3
+
+
+def test_index_stores_one_posting_per_chunk_term_pair():
+    chunks = [f"topic{i} shared energy cells" for i in range(2000)]
+    index = BM25Index(chunks)
+
+    assert len(index._postings_weights) == 2000 * 4
+    assert index.search("topic1234", k=1)[0][0] == 1234
+    scores = index.scores("shared energy")
+    assert scores.shape == (2000,) and np.allclose(scores, scores[0])
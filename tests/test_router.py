@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from src.llm.router import ModelRouter, Route
+
+
+class Unavailable(Exception):
+    status_code = 503
+
+
+def make_router(**kwargs):
+    routes = {"flashcards": Route("fast", "large")}
+    return ModelRouter(routes, **{"hedge_after": 0.05, "min_samples": 2, **kwargs})
+
+
+def test_slow_primary_is_hedged_and_fallback_wins():
+    router = make_router()
+    release = threading.Event()
+    calls = []
+
+    def call(model, final):
+        calls.append((model, final))
+        if model == "fast":
+            release.wait(2)
+            return "slow"
+        return "quick"
+
+    assert router.call("flashcards", call) == "quick"
+    release.set()
+    assert calls == [("fast", False), ("large", True)]
+    assert router.snapshot()["decisions"][-1]["reason"] == "hedged"
+
+
+def test_errors_fail_over_then_demote_the_primary():
+    router = make_router(hedge_after=0)
+
+    def call(model, final):
+        if model == "fast":
+            raise Unavailable("busy")
+        return model
+
+    assert [router.call("flashcards", call) for _ in range(2)] == ["large", "large"]
+    assert [d["reason"] for d in router.snapshot()["decisions"]] == ["failover", "failover"]
+
+    assert router.order("flashcards") == (["large", "fast"], "demoted")
+    assert router.call("flashcards", call) == "large"
+    assert router.snapshot()["models"]["fast"]["error_rate"] == 1.0
+
+
+def test_error_from_every_model_is_raised():
+    router = make_router(hedge_after=0)
+
+    def call(model, final):
+        time.sleep(0.001)
+        raise Unavailable(model)
+
+    with pytest.raises(Unavailable, match="large"):
+        router.call("flashcards", call)
+    assert router.snapshot()["decisions"][-1]["reason"] == "failed"
+
+
+def test_throttled_limiter_never_hedges_or_counts_as_latency():
+    from src.llm.rate_limiter import RateLimiter
+
+    router = make_router(hedge_after=0.05)
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=0)
+    limiter.requests.tokens = 0  # next slot in 0.1s, twice the hedge deadline
+    calls = []
+
+    def acquire(block):
+        if block:
+            limiter.acquire()
+            return True
+        return limiter.try_acquire()
+
+    def call(model, final):
+        calls.append(model)
+        time.sleep(0.01 if len(calls) == 1 else 0.08)
+        return model
+
+    assert router.call("flashcards", call, acquire) == "fast"
+    limiter.requests.tokens = 0
+    assert router.call("flashcards", call, acquire) == "fast"
+
+    assert calls == ["fast", "fast"]
+    assert [d["reason"] for d in router.snapshot()["decisions"]] == ["primary", "primary"]
+    assert router.snapshot()["models"]["fast"]["p50_seconds"] < 0.1
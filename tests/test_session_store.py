@@ -0,0 +1,121 @@
+import time
+
+from src.cache import session_store
+from src.cache.session_store import RedisSessionStore, SQLiteSessionStore
+from src.models.quiz_records import QuizQuestion
+from src.models.summary_schema import SummarySchema
+from src.utils.quiz_manager import QuizManager
+
+
+class LocalRedis:
+    """In-process stand-in for the subset of the redis-py client the store uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        value, expires = self.data.get(key, (None, None))
+        if expires is not None and time.monotonic() >= expires:
+            self.data.pop(key, None)
+            return None
+        return value
+
+    def get(self, key):
+        return self._live(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def expire(self, key, seconds):
+        if self._live(key) is not None:
+            self.data[key] = (self.data[key][0], time.monotonic() + seconds)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def make_manager():
+    manager = QuizManager()
+    manager.questions = [QuizQuestion(type="MCQ", question="Q1", correct_answer="a", explanation="e", options=("a", "b"))]
+    manager.summary = SummarySchema(main_idea="Idea", key_points=["p"])
+    manager.user_answers = ["a"]
+    manager.evaluate_quiz()
+    return manager
+
+
+def test_quiz_manager_state_round_trips_through_both_backends(tmp_path):
+    manager = make_manager()
+    for store in (SQLiteSessionStore(str(tmp_path / "sessions.db")), RedisSessionStore(LocalRedis(), idle_seconds=60)):
+        store.save("sid", {"quiz_manager": manager.to_state()})
+        restored = QuizManager.from_state(store.load("sid")["quiz_manager"])
+
+        assert restored.questions == manager.questions
+        assert restored.results == manager.results
+        assert restored.score == (1, 1)
+        assert restored.summary == manager.summary
+
+
+def test_idle_sessions_are_evicted():
+    now = [1000.0]
+    store = SQLiteSessionStore(":memory:", idle_seconds=60, clock=lambda: now[0])
+    store.save("old", {"step": 1})
+    now[0] += 30
+    store.save("active", {"step": 2})
+    assert store.load("old") == {"step": 1}
+
+    now[0] += 45
+    store.save("other", {"step": 3})
+    assert store.count() == 3
+
+    now[0] += 61
+    assert store.load("active") is None
+    store.save("new", {"step": 1})
+    assert store.count() == 1
+
+
+def test_app_rehydrates_a_session_saved_elsewhere(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setattr(session_store, "_session_store", SQLiteSessionStore(str(tmp_path / "sessions.db")))
+    monkeypatch.setattr(session_store.settings, "SESSION_STORE", "sqlite")
+    session_store.get_session_store().save("sid-1", {
+        "quiz_manager": make_manager().to_state(),
+        "quiz_generated": True, "quiz_submitted": True, "step": 3, "source_content": "",
+    })
+
+    at = AppTest.from_file("../app.py", default_timeout=30)
+    at.query_params["sid"] = "sid-1"
+    at.run()
+
+    assert not at.exception
+    assert [m.value for m in at.metric] == ["1/1"]
+
+
+def test_app_writes_the_source_once_and_keeps_it_out_of_the_snapshot(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    saved = []
+    original_save = store.save
+    monkeypatch.setattr(store, "save", lambda sid, state: (saved.append(sid), original_save(sid, state)))
+    monkeypatch.setattr(session_store, "_session_store", store)
+    monkeypatch.setattr(session_store.settings, "SESSION_STORE", "sqlite")
+
+    at = AppTest.from_file("../app.py", default_timeout=30)
+    at.query_params["sid"] = "sid-1"
+    at.run()
+    at.text_input(key="topic_input").input("Photosynthesis " * 1000)
+    at.button(key="continue_btn").click().run()
+    at.run()
+    at.run()
+
+    assert not at.exception
+    snapshot = store.load("sid-1")
+    assert "source_content" not in snapshot
+    assert store.load(f"source:{snapshot['source_digest']}") == {"source_content": "Photosynthesis " * 1000}
+    assert sum(sid.startswith("source:") for sid in saved) == 1
+
+    del at.session_state["quiz_manager"]
+    at.session_state["source_content"] = ""
+    at.run()
+    assert at.session_state.source_content == "Photosynthesis " * 1000
@@ -0,0 +1,16 @@
+from src.utils.similarity import NearDuplicateFilter, char_ngram_vector
+
+
+def test_paraphrases_are_rejected_and_distinct_questions_kept():
+    dedup = NearDuplicateFilter(threshold=0.85)
+
+    assert dedup.add("What is the powerhouse of the cell?")
+    assert not dedup.add("What is the Powerhouse of the cell")
+    assert dedup.add("Which pigment absorbs light during photosynthesis?")
+    assert dedup.rejected == 1
+
+
+def test_vectors_are_normalized():
+    vector = char_ngram_vector("Mitochondria")
+    assert abs(float(vector @ vector) - 1.0) < 1e-5
+    assert not char_ngram_vector("").any()
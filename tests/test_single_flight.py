@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from src.cache.single_flight import SingleFlight
+from src.common.custom_exception import CustomException
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_llm_call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "summary"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow_llm_call)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", slow_llm_call))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert results == ["summary"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_followers_see_the_leaders_error_and_key_is_released():
+    flight = SingleFlight()
+    call, leader = flight.begin("key")
+    follower_call, follower_is_leader = flight.begin("key")
+    assert leader and not follower_is_leader
+
+    flight.finish("key", call, error=RuntimeError("groq down"))
+    with pytest.raises(CustomException):
+        flight.wait(follower_call)
+
+    assert flight.do("key", lambda: "retry") == "retry"
+
+
+def test_follower_wait_times_out_when_leader_never_finishes():
+    flight = SingleFlight()
+    flight.begin("key")
+    follower_call, _ = flight.begin("key")
+
+    with pytest.raises(CustomException):
+        flight.wait(follower_call, timeout=0.05)
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from src.generator.study_pipeline import StudyMaterialPipeline
+from src.utils.quiz_manager import QuizManager
+
+
+class FakeGenerator:
+    def generate_summary(self, topic):
+        return SimpleNamespace(main_idea=topic, key_points=["point"])
+
+    def stream_summary(self, topic):
+        yield SimpleNamespace(main_idea=topic[:4], key_points=[])
+        yield self.generate_summary(topic)
+
+    def generate_flashcards(self, topic, num_cards=5):
+        raise RuntimeError("flashcards unavailable")
+
+    def stream_flashcards(self, topic, num_cards=5):
+        yield from ()
+        self.generate_flashcards(topic, num_cards)
+
+    def generate_fill_blank_batch(self, topic, difficulty="medium", num_questions=5, variant=None):
+        subjects = ["sky", "grass", "sun", "ocean", "snow"]
+        return [
+            SimpleNamespace(question=f"The {subjects[i]} is _____.", answer="colored", explanation="Look.")
+            for i in range(num_questions)
+        ]
+
+
+def test_pipeline_streams_stages_and_keeps_partial_results():
+    manager = QuizManager()
+    pipeline = StudyMaterialPipeline(FakeGenerator(), manager)
+
+    events = list(pipeline.run("topic", "Fill in the Blank", "Easy", 3, 2, summary_topic="long topic"))
+
+    finished = {e.stage: e.status for e in events if e.status in ("done", "error")}
+    partials = [e.value.main_idea for e in events if e.status == "partial"]
+    assert partials == ["long"]
+    assert finished == {"summary": "done", "flashcards": "error", "quiz": "done"}
+    assert manager.summary.main_idea == "long topic"
+    assert manager.flashcards == []
+    assert len(manager.questions) == 3
+    assert set(pipeline.errors) == {"flashcards"}
@@ -0,0 +1,110 @@
+import json
+
+from src.cache import study_sets
+from src.cache.study_sets import (
+    StudySetLibrary, dumps_study_set, iter_study_sets, load_study_set, make_study_set, study_set_meta, validate_study_set,
+    write_study_sets,
+)
+from src.generator.batch import read_requests, run_batch
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_llm import FakeChatModel
+from src.llm.groq_client import override_llm
+from src.models.flashcard_schema import Flashcard
+from src.models.quiz_records import QuizQuestion
+from src.models.summary_schema import SummarySchema
+from src.utils.quiz_manager import QuizManager
+
+
+def make_manager(num_questions=5, num_cards=5):
+    manager = QuizManager()
+    manager.summary = SummarySchema(main_idea="Plants make food", key_points=["light", "water"])
+    manager.flashcards = [Flashcard(front=f"Front {i}", back=f"Back {i}") for i in range(num_cards)]
+    manager.questions = [
+        QuizQuestion(type="MCQ", question=f"Q{i}?", correct_answer="a", explanation="because", options=("a", "b", "c", "d"))
+        for i in range(num_questions)
+    ]
+    manager.user_answers = ["a"] * num_questions
+    manager.evaluate_quiz()
+    return manager
+
+
+def test_study_sets_round_trip_through_plain_and_gzip_jsonl(tmp_path):
+    record = make_study_set(study_set_meta("Photosynthesis", "Multiple Choice", "Medium"), make_manager())
+    record = json.loads(dumps_study_set(record))
+
+    for name in ("sets.jsonl", "sets.jsonl.gz"):
+        path = str(tmp_path / name)
+        assert write_study_sets([record, record], path) == 2
+        assert list(iter_study_sets(path)) == [record, record]
+        with open(path, "rb") as f:
+            assert list(iter_study_sets(f.read())) == [record, record]
+
+    restored = load_study_set(record)
+    assert restored.score == (5, 5)
+    assert restored.questions[0].options == ("a", "b", "c", "d")
+    fresh = load_study_set(record, num_questions=2, num_cards=1, with_results=False)
+    assert (len(fresh.questions), len(fresh.flashcards), fresh.results, fresh.score) == (2, 1, [], None)
+
+
+def test_library_matches_normalized_source_and_requested_counts(tmp_path):
+    path = str(tmp_path / "library.jsonl")
+    write_study_sets([make_study_set(study_set_meta("Cell  biology\nbasics", "Multiple Choice", "Easy"), make_manager())], path)
+    library = StudySetLibrary(path)
+
+    assert library.find("Cell biology basics", "Multiple Choice", "easy", 5, 5) is not None
+    assert library.find("Cell biology basics", "Multiple Choice", "easy", 6, 5) is None
+    assert library.find("Cell biology basics", "Fill in the Blank", "easy", 1, 1) is None
+
+
+def test_batch_generates_each_topic_once(tmp_path):
+    topics = tmp_path / "topics.txt"
+    topics.write_text('Photosynthesis\n\n{"topic": "Mitosis", "difficulty": "Hard", "num_cards": 2}\nPhotosynthesis\n')
+    output = str(tmp_path / "sets.jsonl")
+    requests = read_requests(str(topics), {"question_type": "Multiple Choice", "difficulty": "Easy", "num_questions": 3, "num_cards": 3})
+    llm = FakeChatModel(latency=0, seed=1)
+
+    with override_llm(llm):
+        generator = QuestionGenerator()
+        assert run_batch(requests, output, concurrency=2, generator=generator) == (2, 0)
+        calls = llm.calls
+        assert run_batch(requests, output, concurrency=2, generator=generator) == (0, 0)
+
+    assert llm.calls == calls
+    records = {r["title"]: r for r in iter_study_sets(output)}
+    assert records["Mitosis"]["difficulty"] == "Hard"
+    assert len(records["Mitosis"]["quiz_manager"]["flashcards"]) == 2
+    assert len(records["Photosynthesis"]["quiz_manager"]["questions"]) == 3
+
+
+def test_app_serves_pregenerated_set_without_a_job(tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    path = str(tmp_path / "library.jsonl")
+    write_study_sets([make_study_set(study_set_meta("Photosynthesis", "Multiple Choice", "Medium"), make_manager())], path)
+    monkeypatch.setattr(study_sets.settings, "STUDY_SET_LIBRARY_PATH", path)
+    monkeypatch.setattr(study_sets, "_library", None)
+
+    at = AppTest.from_file("../app.py", default_timeout=30)
+    at.run()
+    at.text_input(key="topic_input").input("Photosynthesis")
+    at.button(key="continue_btn").click().run()
+    at.button(key="gen_btn").click().run()
+
+    assert not at.exception
+    assert at.session_state.quiz_generated
+    assert at.session_state.job_id is None
+    assert at.session_state.quiz_manager.results == []
+    assert at.session_state.study_set["title"] == "Photosynthesis"
+
+
+def test_foreign_or_malformed_records_are_rejected():
+    import pytest
+
+    with pytest.raises(ValueError):
+        validate_study_set({"title": "not a study set"})
+    record = make_study_set(study_set_meta("Photosynthesis", "Multiple Choice", "Medium"), make_manager())
+    assert validate_study_set(record) is record
+
+    record["quiz_manager"]["questions"] = [{"question": "missing fields"}]
+    with pytest.raises(ValueError):
+        load_study_set(record)